@@ -7,23 +7,65 @@ from pathlib import Path
 # URL cible
 TARGET_URL = "https://www.winamax.fr/paris-sportifs/sports/100000"
 
+# Pages parcourues à chaque run : les boosts apparaissent aussi sur les pages
+# par sport et par compétition (ex. ".../paris-sportifs/sports/1" pour le football).
+# Surchargé en ligne de commande par --url.
+TARGET_URLS = [
+    TARGET_URL,
+]
+
 # Chemins de sortie
 BASE_DIR = Path(__file__).resolve().parent
 OUTPUT_DIR = BASE_DIR / "output"
 SCREENSHOTS_DIR = OUTPUT_DIR / "screenshots"
 JSON_DIR = OUTPUT_DIR / "json"
 CSV_DIR = OUTPUT_DIR / "csv"
+PAYLOADS_DIR = OUTPUT_DIR / "payloads"
+CACHE_DIR = OUTPUT_DIR / "cache"
+PARQUET_DIR = OUTPUT_DIR / "parquet"
+SQLITE_PATH = OUTPUT_DIR / "cotes.db"
 
 # Créer les dossiers s'ils n'existent pas
-for directory in [OUTPUT_DIR, SCREENSHOTS_DIR, JSON_DIR, CSV_DIR]:
+for directory in [OUTPUT_DIR, SCREENSHOTS_DIR, JSON_DIR, CSV_DIR, PAYLOADS_DIR, CACHE_DIR, PARQUET_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
+# Sauvegarder les screenshots sur disque (en arrière-plan, hors chemin critique)
+SAVE_SCREENSHOTS = True
+
 # Paramètres de scraping
 HEADLESS = True
 TIMEOUT = 30
-DELAY = 2  # Délai en secondes entre les actions
+DELAY = 2  # Pause de repli (s) si l'attente événementielle échoue
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
+# Texte qui identifie une carte de cote boostée
+BOOST_CARD_PATTERN = "(COTE.*BOOST|BOOST.*COTE)"
+
+# Attente de la page sur signaux réels (remplace les pauses fixes)
+READINESS = {
+    "timeout_ms": 15000,        # Borne haute absolue d'une attente
+    "quiet_ms": 500,            # Cartes sans mutation depuis au moins... (le reste du DOM est ignoré)
+    "stable_ms": 700,           # ... et nombre de cartes inchangé depuis au moins
+    "empty_quiet_ms": 3000,     # Page chargée et toujours sans carte depuis : on arrête
+    "poll_ms": 100,
+    "scroll_timeout_ms": 3000,  # Borne haute après chaque scroll
+    "max_scrolls": 3,
+    "card_pattern": BOOST_CARD_PATTERN
+}
+
+# Détection de changement : sauter extraction et export si la page est identique
+# au run précédent (main.py --force pour forcer)
+CHANGE_DETECTION = {
+    "enabled": True
+}
+
+# Exécution concurrente des méthodes (--method all)
+CONCURRENCY = {
+    "max_methods": 4,       # Méthodes actives en même temps
+    "max_pages": 4,         # Pages ouvertes en même temps dans le Chromium partagé
+    "page_timeout_s": 60    # Durée max d'une page (chargement + extraction) avant abandon
+}
+
 # Paramètres Selenium
 SELENIUM_OPTIONS = {
     "headless": HEADLESS,
@@ -40,13 +82,161 @@ PLAYWRIGHT_OPTIONS = {
     "user_agent": USER_AGENT
 }
 
+# Arguments de lancement de Chromium (Playwright)
+CHROMIUM_ARGS = ['--no-sandbox', '--disable-setuid-sandbox']
+
+# Profil Chromium : "lean" (allégé) ou "default"
+BROWSER_PROFILE = "lean"
+LEAN_CHROMIUM_ARGS = [
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-domain-reliability',
+    '--disable-client-side-phishing-detection',
+    '--disable-features=Translate,MediaRouter,OptimizationHints',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-first-run',
+    '--js-flags=--max-old-space-size=512'
+]
+
+# Blocage des ressources inutiles au parsing
+RESOURCE_BLOCKING = {
+    "enabled": True,
+    "resource_types": ["image", "media", "font"],
+    # L'OCR lit le rendu : on garde les polices pour ne pas dégrader le texte
+    "ocr_resource_types": ["image", "media"],
+    "url_patterns": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*facebook.net*",
+        "*connect.facebook.com*",
+        "*hotjar*",
+        "*criteo*",
+        "*taboola*",
+        "*outbrain*",
+        "*adnxs.com*",
+        "*scorecardresearch.com*",
+        "*bat.bing.com*",
+        "*analytics.tiktok.com*",
+        "*sc-static.net*"
+    ]
+}
+
+# Taille moyenne estimée (octets) d'une requête bloquée, pour le rapport
+BLOCKED_BYTES_ESTIMATE = {
+    "image": 30000,
+    "media": 500000,
+    "font": 40000,
+    "script": 60000,
+    "other": 10000
+}
+
+# Pool de navigateurs (Chromium gardé chaud entre les scrapes)
+BROWSER_POOL = {
+    "max_uses": 20,        # Recycler le navigateur après N pages servies
+    "max_rss_mb": 1500,    # ... ou quand la mémoire du processus dépasse ce seuil
+    "warm_context": True   # Pré-créer un contexte réutilisé par les scrapers
+}
+
+# Fusion des résultats de plusieurs méthodes (--method all / auto)
+FUSION = {
+    "method_weights": {        # Fiabilité relative de chaque méthode
+        "network": 1.0,
+        "playwright": 0.9,
+        "selenium": 0.9,
+        "ocr": 0.6
+    },
+    "default_weight": 0.5,
+    "match_threshold": 0.75,   # Score minimal pour rapprocher deux cotes (similarité + bonus)
+    "same_time_bonus": 0.1,    # Bonus si même heure de match
+    "same_odds_bonus": 0.2,    # Bonus si même cote boostée
+    "text_similarity": 0.6,    # Deux textes votent ensemble au-delà de ce ratio
+    "odds_tolerance": 0.01,
+    "min_confidence": 0.7      # En dessous (--method auto) : l'OCR est lancé en renfort
+}
+
+# Dédoublonnage approché des cotes (MinHash + LSH sur le texte normalisé)
+FUZZY_DEDUP = {
+    "threshold": 0.7,     # Similarité de Jaccard estimée au-delà de laquelle deux boosts sont identiques
+    "num_perm": 128,      # Taille des signatures MinHash
+    "shingle_size": 3,    # Shingles de 3 caractères : robustes à un caractère mal lu
+    "exact_words": ["plus", "moins", "over", "under"],  # Comme les nombres : doivent être identiques
+    "word_similarity": 0.5  # Un mot propre à un seul texte doit être une lecture proche d'un mot de l'autre
+}
+
+# Mode veille (main.py --watch) : processus résident, navigateur gardé chaud
+WATCH = {
+    "interval_s": 60,      # Intervalle entre deux débuts de run
+    "max_failures": 5      # Runs en échec d'affilée avant d'abandonner (le superviseur relance)
+}
+
+# Planification adaptative du mode veille (sans --interval explicite)
+SCHEDULER = {
+    "enabled": True,
+    "min_interval_s": 60,          # Jamais plus d'un run par minute...
+    "max_interval_s": 1800,        # ... ni moins d'un toutes les 30 minutes
+    "runs_per_hour": 30,           # Budget sur une heure glissante
+    "change_smoothing": 0.3,       # Poids du dernier run dans le taux de changement
+    "initial_change_rate": 0.5,    # Taux supposé au démarrage
+    "kickoff_window_min": 90,      # Accélérer dans les 90 min avant un coup d'envoi...
+    "polls_before_kickoff": 6      # ... pour passer au moins 6 fois avant le match
+}
+
 # Paramètres OCR
 TESSERACT_CONFIG = r'--oem 3 --psm 6 -l fra'
+# Moteur OCR : "tesserocr" (API gardée en mémoire), "pytesseract" ou "auto"
+OCR_ENGINE = "auto"
+# Jeu de modèles Tesseract : "default" (tessdata système), "fast" ou "best"
+OCR_MODEL = "default"
+TESSDATA_DIRS = {
+    "default": None,
+    "fast": os.environ.get("TESSDATA_FAST"),
+    "best": os.environ.get("TESSDATA_BEST")
+}
+# "roi" : OCR des seules cartes repérées dans le DOM, "full" : page entière
+OCR_MODE = "roi"
 OCR_PREPROCESSING = {
     "scale_factor": 2,  # Agrandir l'image
     "threshold": True,  # Binarisation
     "denoise": True     # Réduction du bruit
 }
+# Pipeline de prétraitement explicite (remplace OCR_PREPROCESSING si défini).
+# Étapes : upscale:<nearest|linear|cubic|lanczos|area>:<facteur>,
+# denoise:<median|bilateral|gaussian|nlm>, threshold:<otsu|adaptive>,
+# invert, contrast:<facteur>. Choisir avec scripts/tune_ocr.py.
+OCR_PIPELINE = None
+
+# OCR pleine page par bandes parallèles
+OCR_TILING = {
+    "enabled": True,
+    "max_tile_mb": 64,   # Mémoire de travail maximale par bande
+    "overlap_px": 60,    # Chevauchement entre bandes (pixels source)
+    "workers": None,     # None = un processus par cœur
+    # Démarrage des processus : jamais "fork", le processus a déjà des threads
+    # (boucle Playwright, Selenium, écriture des images) dont les verrous seraient copiés
+    "start_method": "forkserver"
+}
+
+# Seconde passe OCR sur les cotes et heures (chiffres uniquement)
+OCR_DIGIT_PASS = {
+    "enabled": True,
+    "whitelist": "0123456789,.:",
+    "psm": 7,            # Ligne unique : toutes les zones collées côte à côte
+    "padding": 4,        # Marge (pixels) autour de chaque mot numérique
+    "gap_ratio": 1.5     # Espace entre zones, en hauteurs de zone
+}
+
+# Cache des résultats OCR par hash exact des pixels (cartes et bandes)
+OCR_CACHE = {
+    "enabled": True,
+    "max_entries": 2000,    # Au-delà, éviction des moins récemment utilisées
+    "max_age_hours": 48
+}
 
 # Sélecteurs CSS pour le scraping
 SELECTORS = {
@@ -62,3 +252,5 @@ SELECTORS = {
 DATETIME_FORMAT = "%Y-%m-%d_%H-%M-%S"
 DATE_FORMAT = "%Y-%m-%d"
 TIME_FORMAT = "%H:%M"
+# Fuseau des heures affichées sur la page (les payloads réseau sont en UTC)
+TIMEZONE = "Europe/Paris"
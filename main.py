@@ -2,7 +2,11 @@
 Script principal pour scraper les cotes boostées Winamax
 """
 import argparse
+import gc
+import signal
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -13,7 +17,14 @@ import config
 from scrapers.playwright_scraper import PlaywrightScraper
 from scrapers.selenium_scraper import SeleniumScraper
 from scrapers.ocr_scraper import OCRScraper
+from scrapers.network_scraper import NetworkScraper
+from scrapers.browser_pool import BrowserPool, DriverPool, process_tree_rss_mb
+from scrapers.change_detection import ChangeDetector
+from scrapers.runner import ConcurrentRunner
+from scrapers.scheduler import AdaptiveScheduler
 from utils.data_exporter import DataExporter
+from utils.fusion import OddsFusion, KEY_FIELDS
+from utils.schema import FUSED_SCHEMA
 
 
 def main():
@@ -22,9 +33,9 @@ def main():
     )
     parser.add_argument(
         '--method',
-        choices=['selenium', 'playwright', 'ocr', 'all'],
+        choices=['selenium', 'playwright', 'ocr', 'network', 'all', 'auto'],
         default='playwright',
-        help='Méthode de scraping à utiliser'
+        help='Méthode de scraping à utiliser (auto : Playwright + réseau, OCR si confiance faible)'
     )
     parser.add_argument(
         '--no-headless',
@@ -33,7 +44,7 @@ def main():
     )
     parser.add_argument(
         '--export',
-        choices=['json', 'csv', 'all'],
+        choices=['json', 'csv', 'jsonl', 'sqlite', 'parquet', 'all'],
         default='all',
         help='Format d\'export des données'
     )
@@ -41,7 +52,27 @@ def main():
         '--delay',
         type=int,
         default=config.DELAY,
-        help='Délai en secondes entre les actions'
+        help='Pause de repli (s) si l\'attente événementielle de la page échoue'
+    )
+    parser.add_argument(
+        '--url',
+        action='append',
+        help='Page à scraper (répétable) ; par défaut config.TARGET_URLS'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Rester résident et relancer un scrape à intervalle régulier (arrêt par SIGTERM/Ctrl+C)'
+    )
+    parser.add_argument(
+        '--interval',
+        type=int,
+        help='Secondes entre deux runs en mode --watch (sinon planification adaptative)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Extraire et exporter même si la page n\'a pas changé depuis le dernier run'
     )
     
     args = parser.parse_args()
@@ -50,6 +81,8 @@ def main():
     if args.no_headless:
         config.HEADLESS = False
     config.DELAY = args.delay
+    if args.url:
+        config.TARGET_URLS = args.url
     
     print("=" * 60)
     print("🎰 WINAMAX COTES BOOSTÉES SCRAPER")
@@ -57,62 +90,223 @@ def main():
     print(f"⏰ Début: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"🔧 Méthode: {args.method}")
     print(f"📊 Export: {args.export}")
+    print(f"🌐 Pages: {len(config.TARGET_URLS)}")
+    if args.watch and (args.interval or not config.SCHEDULER['enabled']):
+        print(f"🔁 Veille: un run toutes les {args.interval or config.WATCH['interval_s']}s")
+    elif args.watch:
+        print("🔁 Veille: intervalle adaptatif (changements, coups d'envoi)")
     print("=" * 60)
     
+    # Un seul Chromium partagé par Playwright, l'OCR et le réseau, un driver pour Selenium
+    pool = None
+    if args.method in ['playwright', 'ocr', 'network', 'all', 'auto']:
+        pool = BrowserPool(headless=config.HEADLESS)
+    driver_pool = None
+    if args.method in ['selenium', 'all']:
+        driver_pool = DriverPool()
+    
+    # Empreinte de la page : les méthodes dont la page n'a pas changé s'arrêtent tôt
+    detector = None
+    if config.CHANGE_DETECTION['enabled']:
+        detector = ChangeDetector(force=args.force)
+    
+    exporter = DataExporter()
+    
+    try:
+        scrapers = []
+        if args.method in ['playwright', 'all', 'auto']:
+            scrapers.append(('Playwright', PlaywrightScraper(headless=config.HEADLESS, pool=pool, detector=detector)))
+        if args.method == 'selenium' or args.method == 'all':
+            scrapers.append(('Selenium', SeleniumScraper(headless=config.HEADLESS, driver_pool=driver_pool, detector=detector)))
+        if args.method == 'ocr' or args.method == 'all':
+            scrapers.append(('OCR', OCRScraper(headless=config.HEADLESS, pool=pool, detector=detector)))
+        if args.method in ['network', 'all', 'auto']:
+            scrapers.append(('Réseau', NetworkScraper(headless=config.HEADLESS, pool=pool, detector=detector)))
+        
+        # Méthodes rapides d'abord, l'OCR seulement si la fusion manque de confiance
+        escalation = None
+        if args.method == 'auto':
+            escalation = ('OCR', OCRScraper(headless=config.HEADLESS, pool=pool, detector=detector))
+        
+        if args.watch:
+            watch(args, scrapers, pool, driver_pool, detector, exporter, escalation)
+        else:
+            run_once(args, scrapers, pool, detector, exporter, escalation)
+    
+    except Exception as e:
+        print(f"\n❌ Erreur: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    
+    finally:
+        if detector is not None:
+            detector.save()
+        if pool is not None:
+            pool.close()
+        if driver_pool is not None:
+            driver_pool.close()
+    
+    print("=" * 60)
+    print(f"⏰ Fin: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 60)
+
+
+def run_once(args, scrapers, pool, detector, exporter, escalation=None):
+    """Un run complet : scrape de toutes les méthodes puis exports
+
+    Avec plusieurs méthodes, les cotes sont fusionnées (une par boost) avant
+    l'export ; `escalation` (nom, scraper) n'est lancé que si la fusion
+    manque de confiance.
+    """
     results = []
+    fusion = OddsFusion() if len(scrapers) > 1 or escalation else None
+    if detector is not None:
+        detector.skipped = []
+    
+    # Exports en flux : chaque méthode écrit ses cotes dès qu'elle a terminé
+    timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
+    stream_formats = {'json': ['json'], 'csv': ['csv'], 'jsonl': ['jsonl'], 'all': ['json', 'csv']}
+    # Après fusion, la confiance par champ est exportée avec chaque cote
+    stream = exporter.open_stream(
+        stream_formats.get(args.export, []), f"cotes_{timestamp}",
+        FUSED_SCHEMA if fusion is not None else None
+    )
     
     try:
-        if args.method == 'playwright' or args.method == 'all':
-            print("\n🎭 Scraping avec Playwright...")
-            scraper = PlaywrightScraper(headless=config.HEADLESS)
-            data = scraper.scrape()
+        def collect(name, data, elapsed):
+            """Résultats d'une méthode, exportés dès qu'elle termine"""
             if data:
                 results.extend(data)
-                print(f"✅ {len(data)} cotes extraites avec Playwright")
+                if fusion is None:
+                    stream.write_all(data)
+                print(f"✅ {len(data)} cotes extraites avec {name} ({elapsed:.1f}s)")
         
-        if args.method == 'selenium' or args.method == 'all':
-            print("\n🤖 Scraping avec Selenium...")
-            scraper = SeleniumScraper(headless=config.HEADLESS)
-            data = scraper.scrape()
-            if data:
-                results.extend(data)
-                print(f"✅ {len(data)} cotes extraites avec Selenium")
+        print(f"\n🚦 Méthodes: {', '.join(name for name, _ in scrapers)}")
+        if pool is not None:
+            # En parallèle sur la boucle du pool (Selenium dans un thread)
+            ConcurrentRunner(pool).run(scrapers, collect)
+        else:
+            for name, scraper in scrapers:
+                started = time.perf_counter()
+                collect(name, scraper.scrape(), time.perf_counter() - started)
         
-        if args.method == 'ocr' or args.method == 'all':
-            print("\n👁️ Scraping avec OCR...")
-            scraper = OCRScraper(headless=config.HEADLESS)
-            data = scraper.scrape()
-            if data:
-                results.extend(data)
-                print(f"✅ {len(data)} cotes extraites avec OCR")
+        if fusion is not None:
+            fused = fusion.fuse(results)
+            unchanged = not results and detector is not None and detector.skipped
+            if escalation is not None and not unchanged and fusion.needs_escalation(fused):
+                low = sum(1 for f in fused if f.score < config.FUSION['min_confidence'])
+                print(f"\n🔎 {low}/{len(fused)} cotes peu sûres, {escalation[0]} en renfort")
+                ConcurrentRunner(pool).run([escalation], collect)
+                fused = fusion.fuse(results)
+            report_fusion(len(results), fused)
+            stream.write_all(fused)
+            results[:] = [f.odd for f in fused]
         
         # Export des résultats
+        for filepath in stream.close():
+            print(f"\n💾 Exporté: {filepath}")
+        
         if results:
-            exporter = DataExporter()
-            timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
-            
-            if args.export in ['json', 'all']:
-                json_file = exporter.export_json(results, f"cotes_{timestamp}.json")
-                print(f"\n💾 JSON exporté: {json_file}")
+            if args.export == 'parquet':
+                parquet_dir = exporter.export_parquet(results, f"cotes_{timestamp}")
+                print(f"\n💾 Parquet exporté: {parquet_dir}")
             
-            if args.export in ['csv', 'all']:
-                csv_file = exporter.export_csv(results, f"cotes_{timestamp}.csv")
-                print(f"💾 CSV exporté: {csv_file}")
+            if args.export == 'sqlite':
+                db_file, added = exporter.export_sqlite(results)
+                print(f"\n💾 SQLite: {added} nouvelles cotes dans {db_file}")
             
             print(f"\n✨ Scraping terminé avec succès!")
             print(f"📊 Total: {len(results)} cotes boostées extraites")
+        elif detector and detector.skipped:
+            print(f"\n💤 Aucun changement ({', '.join(detector.skipped)}), export ignoré")
         else:
             print("\n⚠️ Aucune donnée extraite")
     
-    except Exception as e:
-        print(f"\n❌ Erreur: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    finally:
+        stream.close()
+        if detector is not None:
+            detector.save()
     
-    print("=" * 60)
-    print(f"⏰ Fin: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
+    return results
+
+
+def report_fusion(raw_count, fused):
+    """Résumé de la fusion, cotes peu sûres détaillées"""
+    threshold = config.FUSION['min_confidence']
+    low = [f for f in fused if f.score < threshold]
+    print(f"\n🧩 Fusion: {raw_count} cotes -> {len(fused)} boosts ({len(low)} sous {threshold:.0%} de confiance)")
+    for f in low:
+        doubts = ', '.join(
+            f"{field} {f.confidence[field]:.0%}" for field in KEY_FIELDS if f.confidence[field] < threshold
+        )
+        print(f"   ⚠️ {f.odd.description[:50] or f.odd.sport} ({'+'.join(f.methods)}): {doubts}")
+
+
+def watch(args, scrapers, pool, driver_pool, detector, exporter, escalation=None):
+    """Mode veille : un run à la fois jusqu'à SIGTERM/SIGINT
+
+    Sans `--interval`, le délai entre deux runs est choisi par
+    l'AdaptiveScheduler (taux de changement, heures des matchs, budget).
+
+    Le navigateur et son contexte restent chauds d'un run à l'autre ; le pool
+    les recycle selon son nombre d'utilisations et la mémoire. Après un run en
+    échec, le navigateur est relancé ; après trop d'échecs d'affilée, on sort
+    en erreur pour laisser le superviseur (systemd, Docker...) redémarrer.
+    """
+    stop = threading.Event()
+    
+    def request_stop(signum, frame):
+        # Second signal : arrêt immédiat, même au milieu d'un run
+        if stop.is_set():
+            raise KeyboardInterrupt
+        # Le run en cours se termine (exports compris) avant l'arrêt
+        print(f"\n🛑 Signal {signal.Signals(signum).name} reçu, arrêt après le run en cours")
+        stop.set()
+    
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    
+    scheduler = None
+    if not args.interval and config.SCHEDULER['enabled']:
+        scheduler = AdaptiveScheduler()
+    interval = args.interval or config.WATCH['interval_s']
+    
+    failures = 0
+    cycle = 0
+    while not stop.is_set():
+        cycle += 1
+        started = time.monotonic()
+        started_at = datetime.now()
+        print(f"\n🔁 Run #{cycle} ({started_at.strftime('%H:%M:%S')})")
+        results = []
+        try:
+            results = run_once(args, scrapers, pool, detector, exporter, escalation)
+            failures = 0
+        except Exception as e:
+            failures += 1
+            print(f"❌ Run #{cycle} en échec ({failures}/{config.WATCH['max_failures']}): {e}")
+            if failures >= config.WATCH['max_failures']:
+                raise
+            # Navigateur possiblement planté : repartir d'instances neuves
+            if pool is not None:
+                pool.restart()
+            if driver_pool is not None:
+                driver_pool.quit()
+        
+        # Libère les cycles d'objets du run avant de mesurer la mémoire
+        gc.collect()
+        elapsed = time.monotonic() - started
+        print(f"🧠 Mémoire: {process_tree_rss_mb():.0f} Mo, run en {elapsed:.1f}s")
+        
+        if scheduler is not None:
+            scheduler.observe(results, started_at)
+            delay = (scheduler.plan() - datetime.now()).total_seconds()
+        else:
+            delay = interval - elapsed
+        stop.wait(max(0.0, delay))
+    
+    print(f"👋 Veille arrêtée après {cycle} runs")
 
 
 if __name__ == "__main__":
@@ -4,5 +4,7 @@ Package de scrapers pour Winamax
 from .selenium_scraper import SeleniumScraper
 from .playwright_scraper import PlaywrightScraper
 from .ocr_scraper import OCRScraper
+from .network_scraper import NetworkScraper
+from .browser_pool import BrowserPool, DriverPool
 
-__all__ = ['SeleniumScraper', 'PlaywrightScraper', 'OCRScraper']
+__all__ = ['SeleniumScraper', 'PlaywrightScraper', 'OCRScraper', 'NetworkScraper', 'BrowserPool', 'DriverPool']
@@ -0,0 +1,303 @@
+"""
+Pool de navigateurs partagé entre les scrapers
+
+Garde un Chromium (Playwright) et un driver Selenium lancés entre deux scrapes
+pour ne payer le démarrage du navigateur qu'une seule fois, et les recycle
+après un nombre d'utilisations ou quand la mémoire grossit trop.
+"""
+import asyncio
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+import config
+from .resource_blocker import chromium_args
+
+
+def process_tree_rss_mb(pid=None):
+    """Mémoire résidente (Mo) d'un processus et de tous ses descendants"""
+    pid = pid or os.getpid()
+
+    try:
+        import psutil
+        proc = psutil.Process(pid)
+        total = 0
+        for p in [proc] + proc.children(recursive=True):
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    except ImportError:
+        pass
+    except Exception:
+        return 0.0
+
+    # Repli sans psutil : lecture de /proc (Linux uniquement)
+    if not os.path.isdir('/proc'):
+        return 0.0
+
+    parents = {}
+    rss_pages = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        # fields[0] = état, fields[1] = ppid, fields[21] = rss (en pages)
+        parents[int(entry)] = int(fields[1])
+        rss_pages[int(entry)] = int(fields[21])
+
+    tree = {pid}
+    changed = True
+    while changed:
+        changed = False
+        for child, parent in parents.items():
+            if parent in tree and child not in tree:
+                tree.add(child)
+                changed = True
+
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    return sum(rss_pages.get(p, 0) for p in tree) * page_size / (1024 * 1024)
+
+
+def url_slug(url):
+    """Chemin d'une URL réduit à un suffixe de nom de fichier ("sports_100000")"""
+    path = re.sub(r'^[a-z]+://[^/]+', '', url).strip('/')
+    path = re.sub(r'^paris-sportifs/', '', path)
+    return re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_') or 'accueil'
+
+
+class BrowserPool:
+    """Chromium Playwright gardé chaud et partagé entre les scrapers"""
+
+    def __init__(self, headless=None, max_uses=None, max_rss_mb=None, launch_args=None, max_pages=None):
+        self.headless = headless if headless is not None else config.HEADLESS
+        self.max_uses = max_uses or config.BROWSER_POOL['max_uses']
+        self.max_rss_mb = max_rss_mb or config.BROWSER_POOL['max_rss_mb']
+        self.max_pages = max_pages or config.CONCURRENCY['max_pages']
+        self.launch_args = launch_args or chromium_args()
+
+        # Les objets Playwright async sont liés à une boucle : le pool garde la sienne
+        self.loop = asyncio.new_event_loop()
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.uses = 0
+        self.launches = 0
+        self.active_pages = 0
+        self._lock = None
+        self._page_slots = None
+
+    def run(self, coro):
+        """Exécute une coroutine sur la boucle du pool"""
+        return self.loop.run_until_complete(coro)
+
+    async def _launch(self):
+        """Lance Chromium (et pré-crée un contexte si demandé)"""
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=self.launch_args
+        )
+        self.context = None
+        if config.BROWSER_POOL['warm_context']:
+            self.context = await self.new_context()
+
+        self.uses = 0
+        self.launches += 1
+        print(f"🚀 Chromium lancé (pool, lancement #{self.launches})")
+
+    async def _close_browser(self):
+        """Ferme le navigateur courant sans arrêter Playwright"""
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                print(f"⚠️ Erreur fermeture navigateur: {e}")
+        self.browser = None
+        self.context = None
+
+    async def new_context(self, **options):
+        """Crée un contexte avec les options par défaut du projet"""
+        context_options = {
+            'viewport': {'width': 1920, 'height': 1080},
+            'user_agent': config.USER_AGENT
+        }
+        context_options.update(options)
+        return await self.browser.new_context(**context_options)
+
+    def needs_recycle(self):
+        """Indique si le navigateur doit être relancé"""
+        if self.browser is None or not self.browser.is_connected():
+            return True
+        if self.uses >= self.max_uses:
+            print(f"♻️ Recyclage du navigateur après {self.uses} utilisations")
+            return True
+        rss = process_tree_rss_mb()
+        if rss > self.max_rss_mb:
+            print(f"♻️ Recyclage du navigateur (mémoire {rss:.0f} Mo > {self.max_rss_mb} Mo)")
+            return True
+        return False
+
+    async def ensure_browser(self):
+        """Garantit un navigateur utilisable, relancé si nécessaire"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            # On ne recycle jamais sous les pieds d'une page encore ouverte
+            if self.browser is not None and self.active_pages > 0 and self.browser.is_connected():
+                return self.browser
+            if self.needs_recycle():
+                await self._close_browser()
+                await self._launch()
+        return self.browser
+
+    @asynccontextmanager
+    async def page(self, **context_options):
+        """Fournit une page prête à l'emploi puis la rend au pool
+
+        Sans options, la page est ouverte dans le contexte pré-créé (cookies
+        conservés d'un scrape à l'autre). Avec des options, un contexte dédié
+        est créé puis fermé avec la page.
+        """
+        await self.ensure_browser()
+        self.uses += 1
+        self.active_pages += 1
+
+        owned_context = None
+        if context_options or self.context is None:
+            owned_context = await self.new_context(**context_options)
+            context = owned_context
+        else:
+            context = self.context
+
+        page = await context.new_page()
+        try:
+            yield page
+        finally:
+            self.active_pages -= 1
+            try:
+                await page.close()
+                if owned_context is not None:
+                    await owned_context.close()
+            except Exception as e:
+                print(f"⚠️ Erreur fermeture page: {e}")
+
+    async def crawl_async(self, urls, fetch, timeout_s=None):
+        """Exécute `fetch(url)` pour chaque URL, en parallèle dans ce Chromium
+
+        Le nombre de pages ouvertes en même temps est borné pour tout le pool
+        (toutes méthodes confondues) et chaque page a son propre délai : une
+        page lente ou en erreur est abandonnée sans bloquer les autres.
+        Retourne les résultats dans l'ordre des URLs (None si abandon).
+        """
+        if self._page_slots is None:
+            self._page_slots = asyncio.Semaphore(self.max_pages)
+        timeout_s = timeout_s or config.CONCURRENCY['page_timeout_s']
+
+        async def visit(url):
+            # Le délai ne court qu'une fois la place obtenue
+            async with self._page_slots:
+                started = time.perf_counter()
+                try:
+                    return await asyncio.wait_for(fetch(url), timeout_s)
+                except asyncio.TimeoutError:
+                    print(f"⏱️ {url}: abandon après {timeout_s}s")
+                except Exception as e:
+                    print(f"❌ {url}: {e}")
+                finally:
+                    print(f"   📄 {url_slug(url)} ({time.perf_counter() - started:.1f}s)")
+                return None
+
+        return await asyncio.gather(*(visit(url) for url in urls))
+
+    def restart(self):
+        """Ferme le navigateur courant ; la prochaine page en relance un neuf"""
+        if self.loop.is_closed():
+            return
+        self.run(self._close_browser())
+
+    async def close_async(self):
+        """Ferme le navigateur et arrête Playwright"""
+        await self._close_browser()
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+    def close(self):
+        """Libère toutes les ressources du pool"""
+        if self.loop.is_closed():
+            return
+        self.run(self.close_async())
+        self.loop.close()
+        print("🔒 Pool de navigateurs fermé")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class DriverPool:
+    """Driver Selenium gardé en vie entre plusieurs scrapes"""
+
+    def __init__(self, max_uses=None, max_rss_mb=None):
+        self.max_uses = max_uses or config.BROWSER_POOL['max_uses']
+        self.max_rss_mb = max_rss_mb or config.BROWSER_POOL['max_rss_mb']
+        self.driver = None
+        self.uses = 0
+
+    def _is_alive(self):
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, factory):
+        """Retourne un driver utilisable, créé via `factory` si besoin"""
+        recycle = self.driver is None or not self._is_alive()
+        if not recycle and self.uses >= self.max_uses:
+            print(f"♻️ Recyclage du driver après {self.uses} utilisations")
+            recycle = True
+        if not recycle:
+            rss = process_tree_rss_mb()
+            if rss > self.max_rss_mb:
+                print(f"♻️ Recyclage du driver (mémoire {rss:.0f} Mo > {self.max_rss_mb} Mo)")
+                recycle = True
+
+        if recycle:
+            self.quit()
+            self.driver = factory()
+            self.uses = 0
+
+        self.uses += 1
+        return self.driver
+
+    def quit(self):
+        """Ferme le driver courant"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                print(f"⚠️ Erreur fermeture driver: {e}")
+            self.driver = None
+
+    def close(self):
+        self.quit()
+        print("🔒 Pool Selenium fermé")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,149 @@
+"""
+Découpage des cartes de cotes boostées dans du HTML, en une seule passe
+
+Partagé par les scrapers Playwright et Selenium pour le repli sans JS :
+une seule requête sur le texte du document (lxml), les conteneurs de cartes
+trouvés en remontant les ancêtres, et des expressions précompilées pour les
+champs. BeautifulSoup reste utilisable comme backend si lxml manque.
+"""
+import re
+import config
+from .dom_extraction import build_cotes
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+BOOST_TEXT = re.compile(config.BOOST_CARD_PATTERN, re.I)
+CARD_CLASS = re.compile(r'card|boost|bet|event', re.I)
+FALLBACK_CARD_CLASS = re.compile(r'boost|promo|featured', re.I)
+MARKER_LINE = re.compile(r'COTE|BOOST', re.I)
+TIME_RE = re.compile(r'\b([0-2]?[0-9]:[0-5][0-9])\b')
+ODDS_RE = re.compile(r'\b(\d+[,\.]\d{2})\b')
+ODDS_LINE = re.compile(r'^\d+[,\.]\d{2}$')
+TIME_LINE = re.compile(r'^\d{1,2}:\d{2}$')
+
+EXSLT_NS = {'re': 'http://exslt.org/regular-expressions'}
+BOOST_TEXT_XPATH = f"//text()[re:test(., '{config.BOOST_CARD_PATTERN}', 'i')]"
+FALLBACK_CARD_XPATH = "//div[re:test(@class, 'boost|promo|featured', 'i')]"
+
+
+def _lxml_segments(html_content):
+    """Cartes (listes de lignes) via lxml"""
+    tree = lxml.html.fromstring(html_content)
+    cards = []
+    seen = set()
+
+    for text in tree.xpath(BOOST_TEXT_XPATH, namespaces=EXSLT_NS):
+        parent = text.getparent()
+        # Texte de queue : il appartient au parent de l'élément porteur
+        if text.is_tail:
+            parent = parent.getparent()
+        if parent is None:
+            continue
+
+        card = None
+        nearest_div = None
+        for element in [parent] + list(parent.iterancestors()):
+            if element.tag != 'div':
+                continue
+            if nearest_div is None:
+                nearest_div = element
+            if CARD_CLASS.search(element.get('class', '')):
+                card = element
+                break
+        card = card if card is not None else nearest_div
+
+        if card is None or card in seen:
+            continue
+        seen.add(card)
+        cards.append([t.strip() for t in card.itertext() if t.strip()])
+
+    if not cards:
+        for card in tree.xpath(FALLBACK_CARD_XPATH, namespaces=EXSLT_NS):
+            cards.append([t.strip() for t in card.itertext() if t.strip()])
+
+    return cards
+
+
+def _soup_segments(html_content):
+    """Cartes (listes de lignes) via BeautifulSoup"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'lxml' if HAS_LXML else 'html.parser')
+    cards = []
+    seen = set()
+
+    for text in soup.find_all(string=BOOST_TEXT):
+        card = None
+        nearest_div = None
+        for element in text.parents:
+            if element.name != 'div':
+                continue
+            if nearest_div is None:
+                nearest_div = element
+            if CARD_CLASS.search(' '.join(element.get('class', []))):
+                card = element
+                break
+        card = card if card is not None else nearest_div
+
+        if card is None or id(card) in seen:
+            continue
+        seen.add(id(card))
+        cards.append(list(card.stripped_strings))
+
+    if not cards:
+        for card in soup.find_all('div', class_=FALLBACK_CARD_CLASS):
+            cards.append(list(card.stripped_strings))
+
+    return cards
+
+
+def segment_cards(html_content, backend=None):
+    """Découpe le HTML en cartes, chacune donnée par ses lignes de texte
+
+    `backend` vaut "lxml" (par défaut si disponible) ou "soup".
+    """
+    backend = backend or ('lxml' if HAS_LXML else 'soup')
+    if backend == 'lxml':
+        return _lxml_segments(html_content)
+    return _soup_segments(html_content)
+
+
+def parse_card(lines):
+    """Champs d'une carte à partir de ses lignes de texte"""
+    card_text = '\n'.join(lines)
+
+    time_match = TIME_RE.search(card_text)
+    odds = [o.replace('.', ',') for o in ODDS_RE.findall(card_text)]
+
+    relevant_lines = [
+        line for line in lines
+        if len(line) > 5
+        and not MARKER_LINE.search(line)
+        and not ODDS_LINE.match(line)
+        and not TIME_LINE.match(line)
+    ]
+
+    if len(relevant_lines) >= 3:
+        description = ' '.join(relevant_lines[2:])
+    else:
+        description = relevant_lines[1] if len(relevant_lines) == 2 else ''
+
+    return {
+        'heure': time_match.group(1) if time_match else '',
+        'sport': relevant_lines[0] if relevant_lines else '',
+        'competition': relevant_lines[1] if len(relevant_lines) >= 2 else '',
+        'description': description,
+        'cote_originale': odds[0] if len(odds) >= 2 else '',
+        'cote_boostee': odds[-1] if odds else ''
+    }
+
+
+def extract_cotes(html_content, method, require_context=False, backend=None):
+    """Cotes boostées contenues dans une page HTML"""
+    cards = [parse_card(lines) for lines in segment_cards(html_content, backend)]
+    return build_cotes(cards, method, require_context=require_context)
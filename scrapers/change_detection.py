@@ -0,0 +1,95 @@
+"""
+Détection de changement : ne pas ré-extraire une page identique au run précédent
+
+Juste après le chargement, on calcule une empreinte du contenu des cartes
+boostées (texte normalisé des cartes dans le DOM, ou cotes normalisées pour
+les payloads réseau). Si elle est identique à celle du dernier run réussi, le
+scraper s'arrête là : ni screenshot, ni extraction, ni export. Seul un
+battement "aucun changement" est enregistré dans le fichier d'état.
+"""
+import hashlib
+import json
+import re
+from datetime import datetime
+import config
+
+
+CONTENT_FIELDS = ['heure', 'sport', 'competition', 'description', 'cote_originale', 'cote_boostee']
+
+
+def fingerprint(parts):
+    """Empreinte SHA-256 d'une liste de textes, indépendante de l'ordre"""
+    normalized = sorted(re.sub(r'\s+', ' ', part).strip().lower() for part in parts)
+    normalized = [part for part in normalized if part]
+    if not normalized:
+        return None
+    return hashlib.sha256('\n'.join(normalized).encode('utf-8')).hexdigest()
+
+
+def cotes_parts(cotes):
+    """Cotes réduites à leur contenu (sans timestamp ni méthode)"""
+    return [json.dumps([cote.get(f, '') for f in CONTENT_FIELDS], ensure_ascii=False) for cote in cotes]
+
+
+def page_key(method, url):
+    """Clé d'état d'une page : la méthode seule pour la page principale"""
+    return method if url == config.TARGET_URL else f"{method} {url}"
+
+
+class ChangeDetector:
+    """Compare l'empreinte de chaque méthode à celle du dernier run réussi"""
+
+    def __init__(self, force=False, path=None):
+        self.force = force
+        self.path = path or config.CACHE_DIR / 'fingerprints.json'
+        self.state = self.load()
+        self.pending = {}
+        self.skipped = []
+
+    def load(self):
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ État de détection illisible, ignoré: {e}")
+            return {}
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        return self.path
+
+    def unchanged(self, method, parts):
+        """True si le contenu est identique au dernier run (battement enregistré)
+
+        Sans carte trouvée ou avec --force, on considère toujours la page
+        comme modifiée pour laisser l'extraction (et ses replis) s'exécuter.
+        """
+        digest = fingerprint(parts)
+        if digest is None:
+            return False
+        now = datetime.now().isoformat()
+        previous = self.state.get(method)
+        if not self.force and previous and previous['fingerprint'] == digest:
+            previous['checked_at'] = now
+            previous['unchanged_runs'] = previous.get('unchanged_runs', 0) + 1
+            self.skipped.append(method)
+            print(f"💤 {method}: aucun changement depuis {previous['changed_at']}")
+            return True
+        self.pending[method] = digest
+        return False
+
+    def accept(self, method):
+        """Retient l'empreinte une fois l'extraction réussie"""
+        digest = self.pending.pop(method, None)
+        if digest is None:
+            return
+        now = datetime.now().isoformat()
+        self.state[method] = {
+            'fingerprint': digest,
+            'changed_at': now,
+            'checked_at': now,
+            'unchanged_runs': 0
+        }
@@ -0,0 +1,158 @@
+"""
+Extraction des cartes de cotes directement dans la page (un seul appel JS)
+
+Évite de sérialiser tout le DOM (page.content / page_source) pour le re-parser
+en Python : la routine localise les cartes "COTE BOOSTEE" dans le navigateur
+et ne renvoie qu'un tableau JSON compact de leurs champs.
+"""
+import config
+from utils.models import OddsBatch
+
+
+# Localisation des conteneurs de cartes, partagée par les routines ci-dessous
+FIND_CARDS_JS = """
+    const findCards = (opts) => {
+        const pattern = new RegExp(opts.pattern, 'i');
+        const cardClass = /card|boost|bet|event/i;
+        const root = document.body || document.documentElement;
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+        const seen = new Set();
+        const cards = [];
+
+        while (walker.nextNode()) {
+            const node = walker.currentNode;
+            if (!pattern.test(node.nodeValue) || !node.parentElement) continue;
+
+            // Remonter jusqu'au conteneur de la carte
+            let card = null;
+            for (let el = node.parentElement; el; el = el.parentElement) {
+                if (el.tagName === 'DIV' && cardClass.test(el.getAttribute('class') || '')) {
+                    card = el;
+                    break;
+                }
+            }
+            card = card || node.parentElement.closest('div');
+            if (!card || seen.has(card)) continue;
+            seen.add(card);
+            cards.push(card);
+        }
+        return cards;
+    };
+"""
+
+EXTRACT_CARDS_JS = """
+(opts) => {
+""" + FIND_CARDS_JS + """
+    const timeRe = /\\b([0-2]?[0-9]:[0-5][0-9])\\b/;
+    const oddsRe = /\\b(\\d+[,.]\\d{2})\\b/g;
+    const oddsLine = /^\\d+[,.]\\d{2}$/;
+    const timeLine = /^\\d{1,2}:\\d{2}$/;
+
+    return findCards(opts).map((card) => {
+        const text = card.innerText || card.textContent || '';
+        const time = text.match(timeRe);
+        const odds = (text.match(oddsRe) || []).map((o) => o.replace('.', ','));
+        const lines = text.split('\\n').map((l) => l.trim()).filter((l) =>
+            l.length > 5 && !/COTE|BOOST/i.test(l) && !oddsLine.test(l) && !timeLine.test(l)
+        );
+
+        return {
+            heure: time ? time[1] : '',
+            sport: lines[0] || '',
+            competition: lines[1] || '',
+            description: lines.length >= 3 ? lines.slice(2).join(' ') : (lines[1] || ''),
+            cote_originale: odds.length >= 2 ? odds[0] : '',
+            cote_boostee: odds.length ? odds[odds.length - 1] : ''
+        };
+    });
+}
+"""
+
+# Boîtes englobantes des cartes, en coordonnées de page (pour l'OCR ciblé)
+CARD_BOXES_JS = """
+(opts) => {
+""" + FIND_CARDS_JS + """
+    return findCards(opts).map((card) => {
+        const rect = card.getBoundingClientRect();
+        return {
+            x: Math.max(0, rect.left + window.scrollX - opts.padding),
+            y: Math.max(0, rect.top + window.scrollY - opts.padding),
+            width: rect.width + 2 * opts.padding,
+            height: rect.height + 2 * opts.padding
+        };
+    }).filter((box) => box.width > 1 && box.height > 1);
+}
+"""
+
+# Texte brut des cartes (empreinte de la page pour la détection de changement)
+CARD_TEXTS_JS = """
+(opts) => {
+""" + FIND_CARDS_JS + """
+    return findCards(opts).map((card) => card.innerText || card.textContent || '');
+}
+"""
+
+SELENIUM_EXTRACT_CARDS_JS = f"return ({EXTRACT_CARDS_JS})(arguments[0]);"
+SELENIUM_CARD_TEXTS_JS = f"return ({CARD_TEXTS_JS})(arguments[0]);"
+
+
+def _options():
+    return {'pattern': config.BOOST_CARD_PATTERN}
+
+
+async def card_boxes_async(page, padding=4):
+    """Boîtes des cartes via Playwright (liste vide en cas d'échec)"""
+    try:
+        options = dict(_options(), padding=padding)
+        return await page.evaluate(CARD_BOXES_JS, options) or []
+    except Exception as e:
+        print(f"⚠️ Localisation des cartes impossible: {e}")
+        return []
+
+
+async def extract_cards_async(page):
+    """Champs des cartes via Playwright (liste vide en cas d'échec)"""
+    try:
+        return await page.evaluate(EXTRACT_CARDS_JS, _options()) or []
+    except Exception as e:
+        print(f"⚠️ Extraction dans la page impossible: {e}")
+        return []
+
+
+def extract_cards(driver):
+    """Champs des cartes via Selenium (liste vide en cas d'échec)"""
+    try:
+        return driver.execute_script(SELENIUM_EXTRACT_CARDS_JS, _options()) or []
+    except Exception as e:
+        print(f"⚠️ Extraction dans la page impossible: {e}")
+        return []
+
+
+async def card_texts_async(page):
+    """Texte des cartes via Playwright (liste vide en cas d'échec)"""
+    try:
+        return await page.evaluate(CARD_TEXTS_JS, _options()) or []
+    except Exception as e:
+        print(f"⚠️ Lecture des cartes impossible: {e}")
+        return []
+
+
+def card_texts(driver):
+    """Texte des cartes via Selenium (liste vide en cas d'échec)"""
+    try:
+        return driver.execute_script(SELENIUM_CARD_TEXTS_JS, _options()) or []
+    except Exception as e:
+        print(f"⚠️ Lecture des cartes impossible: {e}")
+        return []
+
+
+def build_cotes(cards, method, require_context=False):
+    """Transforme les cartes brutes en lot de cotes (un timestamp par run)"""
+    batch = OddsBatch()
+    for card in cards:
+        if not card.get('cote_boostee'):
+            continue
+        if require_context and not (card.get('heure') or card.get('sport')):
+            continue
+        batch.add(card, method)
+    return batch
@@ -0,0 +1,292 @@
+"""
+Scraper lisant directement les données réseau (XHR, WebSocket, état initial)
+
+Les cotes boostées affichées par la page viennent de payloads JSON que le
+navigateur reçoit déjà : on les intercepte et on les convertit en cotes, sans
+parser le DOM ni faire d'OCR. Les payloads bruts sont sauvegardés pour rejouer
+l'extraction hors ligne.
+"""
+import asyncio
+import json
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import config
+from .browser_pool import BrowserPool
+from .resource_blocker import ResourceBlocker
+from .readiness import ReadinessWaiter
+from .change_detection import cotes_parts
+from utils.models import OddsBatch, parse_odd
+from utils.fuzzy_index import dedupe_odds
+
+
+BOOST_MARKER = re.compile(r'boost', re.I)
+# Préfixe numérique des trames socket.io ("42[...]")
+SOCKETIO_PREFIX = re.compile(r'^\d+')
+
+BOOSTED_ODDS_KEY = re.compile(r'(boost.*odd|odd.*boost|^odds?$|^price$|^newodds?$|^cote)', re.I)
+ORIGINAL_ODDS_KEY = re.compile(r'(original|previous|old|initial|base|before).*(odd|price|cote)', re.I)
+START_KEY = re.compile(r'(matchstart|starttime|start_time|kickoff|^start$|^date$|^heure$)', re.I)
+SPORT_KEY = re.compile(r'^sport(name|label)?$', re.I)
+COMPETITION_KEY = re.compile(r'(tournament|competition|league)(name|label)?$', re.I)
+DESCRIPTION_KEY = re.compile(r'^(bettitle|label|title|description|name|text)$', re.I)
+TIME_PATTERN = re.compile(r'\b([0-2]?[0-9]:[0-5][0-9])\b')
+
+
+class NetworkScraper:
+    def __init__(self, headless=None, pool=None, detector=None, urls=None):
+        self.headless = headless if headless is not None else config.HEADLESS
+        self.pool = pool
+        self.detector = detector
+        self.urls = urls or config.TARGET_URLS
+        self.unchanged = False
+        self.blocker = ResourceBlocker()
+        self.waiter = ReadinessWaiter()
+        self.payloads = []
+        self._pending = []
+
+    # --- Capture ------------------------------------------------------------
+
+    def _keep(self, source, url, data):
+        self.payloads.append({
+            'source': source,
+            'url': url,
+            'received_at': datetime.now().isoformat(),
+            'data': data
+        })
+
+    async def _read_response(self, response):
+        """Lit une réponse JSON si elle parle de boost"""
+        try:
+            text = await response.text()
+        except Exception:
+            return
+        if not BOOST_MARKER.search(text):
+            return
+        try:
+            self._keep('xhr', response.url, json.loads(text))
+        except ValueError:
+            pass
+
+    def _on_response(self, response):
+        content_type = response.headers.get('content-type', '')
+        if 'json' in content_type:
+            self._pending.append(asyncio.ensure_future(self._read_response(response)))
+
+    def _on_frame(self, url, payload):
+        """Trame WebSocket reçue (JSON brut ou socket.io)"""
+        if isinstance(payload, bytes):
+            try:
+                payload = payload.decode('utf-8')
+            except UnicodeDecodeError:
+                return
+        if not BOOST_MARKER.search(payload):
+            return
+        try:
+            self._keep('websocket', url, json.loads(SOCKETIO_PREFIX.sub('', payload, count=1)))
+        except ValueError:
+            pass
+
+    def _on_websocket(self, websocket):
+        websocket.on('framereceived', lambda payload: self._on_frame(websocket.url, payload))
+
+    async def capture_page_async(self, pool, url):
+        """Charge une page et capture ses payloads de données"""
+        async with pool.page() as page:
+            try:
+                await self.blocker.attach_async(page)
+                page.on('response', self._on_response)
+                page.on('websocket', self._on_websocket)
+
+                print(f"📄 Chargement de {url}")
+                await page.goto(url, wait_until='domcontentloaded', timeout=config.TIMEOUT * 1000)
+                await self.waiter.wait_async(page)
+
+                # État initial injecté par le serveur dans la page
+                state = await page.evaluate('() => window.PRELOADED_STATE || null')
+                if state and BOOST_MARKER.search(json.dumps(state)):
+                    self._keep('preloaded_state', page.url, state)
+
+                if self._pending:
+                    await asyncio.gather(*self._pending, return_exceptions=True)
+
+            except Exception as e:
+                print(f"❌ Erreur Network ({url}): {e}")
+                import traceback
+                traceback.print_exc()
+
+    async def scrape_async(self, pool=None):
+        """Charge les pages cibles en parallèle et capture les payloads de données"""
+        pool = pool or self.pool
+        self.payloads = []
+        self._pending = []
+        self.waiter.reset()
+        self.blocker.reset()
+
+        await pool.crawl_async(self.urls, lambda url: self.capture_page_async(pool, url))
+        await self._drain_pending()
+        self.waiter.report()
+        self.blocker.report()
+
+        print(f"📡 {len(self.payloads)} payloads avec des boosts capturés")
+        cotes = self.extract_cotes_data(self.payloads)
+
+        # Payloads normalisés identiques au dernier run : rien à sauvegarder
+        if self.detector and self.detector.unchanged('network', cotes_parts(cotes)):
+            self.unchanged = True
+            return OddsBatch()
+
+        if self.payloads:
+            self.save_payloads()
+        if cotes and self.detector:
+            self.detector.accept('network')
+        return cotes
+
+    async def _drain_pending(self):
+        """Termine les lectures de réponses arrivées après le gather de leur page
+
+        Sans cela une lecture tardive d'un run ajouterait son payload au run
+        suivant (--watch) ; celles qui traînent au-delà de TIMEOUT sont annulées.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        _, late = await asyncio.wait(pending, timeout=config.TIMEOUT)
+        for task in late:
+            task.cancel()
+        if late:
+            await asyncio.gather(*late, return_exceptions=True)
+            print(f"⚠️ {len(late)} réponses abandonnées (lecture trop longue)")
+
+    def save_payloads(self):
+        """Sauvegarde les payloads bruts (un JSON par ligne) pour rejeu"""
+        timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
+        filepath = config.PAYLOADS_DIR / f"network_{timestamp}.jsonl"
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for payload in self.payloads:
+                f.write(json.dumps(payload, ensure_ascii=False) + '\n')
+        print(f"💾 Payloads: {filepath}")
+        return filepath
+
+    def replay(self, filepath):
+        """Rejoue l'extraction sur des payloads sauvegardés"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            payloads = [json.loads(line) for line in f if line.strip()]
+        return self.extract_cotes_data(payloads)
+
+    # --- Extraction ---------------------------------------------------------
+
+    def extract_cotes_data(self, payloads):
+        """Convertit les payloads capturés en cotes boostées"""
+        cotes = OddsBatch()
+
+        for payload in payloads:
+            data = payload['data']
+            odds_table = data.get('odds') if isinstance(data, dict) else None
+            for node, ancestors in self._iter_boost_nodes(data, []):
+                cote_data = self._build_cote(node, ancestors, odds_table)
+                if cote_data:
+                    cotes.add(cote_data, 'network')
+
+        # Un même boost arrive souvent par XHR et par WebSocket
+        return dedupe_odds(cotes)
+
+    def _iter_boost_nodes(self, obj, ancestors, marked=False):
+        """Parcourt le JSON et renvoie les objets marqués comme boost
+
+        Un objet est marqué s'il a une clé ou une valeur texte contenant
+        "boost", ou s'il est rangé sous une telle clé ({"boosts": [...]}).
+        """
+        if isinstance(obj, dict):
+            if marked or any(BOOST_MARKER.search(k) for k in obj) or any(
+                isinstance(v, str) and BOOST_MARKER.search(v) for v in obj.values()
+            ):
+                yield obj, ancestors
+            for key, value in obj.items():
+                if isinstance(value, (dict, list)):
+                    yield from self._iter_boost_nodes(
+                        value, ancestors + [obj], bool(BOOST_MARKER.search(key))
+                    )
+        elif isinstance(obj, list):
+            for value in obj:
+                if isinstance(value, (dict, list)):
+                    yield from self._iter_boost_nodes(value, ancestors, marked)
+
+    @staticmethod
+    def _find(node, ancestors, key_pattern, accept):
+        """Cherche un champ dans l'objet puis dans ses parents (le plus proche d'abord)"""
+        for scope in [node] + ancestors[::-1]:
+            for key, value in scope.items():
+                if key_pattern.search(key) and accept(value):
+                    return value
+        return None
+
+    @staticmethod
+    def _is_odd(value):
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, str):
+            value = value.replace(',', '.')
+        try:
+            return 1.0 < float(value) < 1000
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def _format_time(value):
+        """Heure HH:MM (heure de Paris, comme sur la page) depuis un epoch (s ou ms), une date ISO ou un texte"""
+        tz = ZoneInfo(config.TIMEZONE)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            seconds = value / 1000 if value > 1e11 else value
+            return datetime.fromtimestamp(seconds, tz).strftime(config.TIME_FORMAT)
+        if isinstance(value, str):
+            try:
+                moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+                # Sans fuseau, la date est déjà à l'heure de la page
+                if moment.tzinfo is not None:
+                    moment = moment.astimezone(tz)
+                return moment.strftime(config.TIME_FORMAT)
+            except ValueError:
+                match = TIME_PATTERN.search(value)
+                return match.group(1) if match else ''
+        return ''
+
+    def _build_cote(self, node, ancestors, odds_table):
+        is_text = lambda v: isinstance(v, str) and v.strip() != ''
+
+        boosted = self._find(node, [], BOOSTED_ODDS_KEY, self._is_odd)
+        if boosted is None and isinstance(odds_table, dict):
+            # État normalisé : les cotes sont indexées par identifiant d'issue
+            outcome_id = node.get('outcomeId', node.get('id'))
+            if outcome_id is not None and self._is_odd(odds_table.get(str(outcome_id))):
+                boosted = odds_table[str(outcome_id)]
+        if boosted is None:
+            return None
+
+        original = self._find(node, ancestors, ORIGINAL_ODDS_KEY, self._is_odd)
+        start = self._find(node, ancestors, START_KEY, lambda v: v not in (None, ''))
+        sport = self._find(node, ancestors, SPORT_KEY, is_text)
+        competition = self._find(node, ancestors, COMPETITION_KEY, is_text)
+        description = self._find(node, ancestors, DESCRIPTION_KEY, is_text)
+
+        return {
+            'heure': self._format_time(start) if start is not None else '',
+            'sport': sport or '',
+            'competition': competition or '',
+            'description': description or '',
+            'cote_originale': parse_odd(original),
+            'cote_boostee': parse_odd(boosted)
+        }
+
+    def scrape(self):
+        """Point d'entrée synchrone"""
+        try:
+            print("🚀 Démarrage du scraping réseau...")
+            if self.pool is not None:
+                return self.pool.run(self.scrape_async())
+
+            with BrowserPool(headless=self.headless) as pool:
+                return pool.run(self.scrape_async(pool))
+        except Exception as e:
+            print(f"❌ Erreur: {e}")
+            return OddsBatch()
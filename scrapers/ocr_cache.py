@@ -0,0 +1,105 @@
+"""
+Cache persistant des résultats OCR, indexé par hash exact du contenu de l'image
+
+D'un run à l'autre la plupart des cartes boostées sont identiques : on hache
+les pixels de chaque carte (ou bande) et, si l'image a déjà été lue, on reprend
+le texte et les champs au lieu de relancer Tesseract. Le hash est exact : un
+hash perceptuel (dHash) réduit l'image au point qu'un chiffre de cote modifié
+ne change pas la clé, et le cache rendrait alors l'ancienne cote.
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+import config
+from .preprocessing import default_pipeline
+
+
+def image_key(gray):
+    """Clé d'une image décodée : dimensions + BLAKE2b de ses pixels"""
+    digest = hashlib.blake2b(gray.tobytes(), digest_size=16).hexdigest()
+    return f"{gray.shape[0]}x{gray.shape[1]}:{digest}"
+
+
+class OCRCache:
+    """Résultats OCR par hash d'image, avec éviction par taille et par âge"""
+
+    def __init__(self, signature='', path=None, settings=None):
+        # La signature (pipeline + options Tesseract) invalide le cache si elle change
+        self.signature = signature
+        self.settings = settings or config.OCR_CACHE
+        self.path = path or config.CACHE_DIR / 'ocr_cache.json'
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Cache OCR illisible, repart de zéro: {e}")
+            return
+        if data.get('signature') == self.signature:
+            self.entries = OrderedDict(data.get('entries', {}))
+            self.evict()
+
+    def save(self):
+        self.evict()
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': self.signature, 'entries': self.entries}, f, ensure_ascii=False)
+        tmp_path.replace(self.path)
+
+    def evict(self):
+        """Retire les entrées trop vieilles puis les moins récemment utilisées"""
+        max_age = self.settings['max_age_hours'] * 3600
+        now = time.time()
+        for key in [k for k, e in self.entries.items() if now - e['created'] > max_age]:
+            del self.entries[key]
+        while len(self.entries) > self.settings['max_entries']:
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        """Entrée {text, fields} déjà lue pour cette image, ou None"""
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, text, fields=None):
+        self.entries[key] = {'text': text, 'fields': fields, 'created': time.time()}
+        self.entries.move_to_end(key)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self.entries)
+        }
+
+    def report(self):
+        stats = self.stats()
+        print(
+            f"🗃️ Cache OCR: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['entries']} entrées"
+        )
+        return stats
+
+
+def default_cache():
+    """Cache lié au prétraitement et au modèle configurés (None si désactivé)"""
+    if not config.OCR_CACHE['enabled']:
+        return None
+    signature = (
+        f"{default_pipeline()!r}|{config.TESSERACT_CONFIG}|{config.OCR_MODEL}"
+        f"|digits={config.OCR_DIGIT_PASS['enabled']}|key=blake2b"
+    )
+    return OCRCache(signature)
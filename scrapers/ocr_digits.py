@@ -0,0 +1,132 @@
+"""
+Seconde passe OCR restreinte aux chiffres pour les cotes et les heures
+
+La lecture générale (français) confond O/0, l/1 ou perd la virgule, ce qui
+fausse ou supprime les cotes. On repère les mots numériques grâce aux boîtes
+de `image_to_data`, puis on relit uniquement ces petites zones en mode ligne
+unique avec une liste blanche de caractères. Toutes les zones sont collées
+côte à côte dans une seule image : un seul appel Tesseract pour toute la
+seconde passe.
+"""
+import re
+import cv2
+import numpy as np
+import config
+from .ocr_engine import get_engine, parse_tesseract_config
+
+
+# Mot qui ressemble à une cote ou une heure, erreurs de lecture comprises
+NUMERIC_CANDIDATE = re.compile(r'^[\dOoIl|SB,.:;]{3,6}$')
+ODDS_VALUE = re.compile(r'^\d{1,3}[,.]\d{2}$')
+TIME_VALUE = re.compile(r'^[0-2]?\d:[0-5]\d$')
+
+
+def digit_config(settings=None):
+    """Options Tesseract de la passe chiffres (mêmes modèles, ligne unique)"""
+    settings = settings or config.OCR_DIGIT_PASS
+    options = parse_tesseract_config(config.TESSERACT_CONFIG)
+    return (
+        f"--oem {options['oem']} --psm {settings['psm']} -l {options['lang']} "
+        f"-c tessedit_char_whitelist={settings['whitelist']}"
+    )
+
+
+def is_candidate(text):
+    return bool(NUMERIC_CANDIDATE.match(text)) and any(c.isdigit() for c in text)
+
+
+def normalize_number(text, original):
+    """Valeur relue si elle forme une cote ou une heure valide, sinon None"""
+    text = text.strip()
+    if re.fullmatch(r'\d{3}', text) and re.search(r'[,.;]', original):
+        # Virgule vue par la première lecture mais perdue ici : "260" -> "2,60"
+        # (sans séparateur, "180 tirs" reste un nombre et non une cote)
+        text = f"{text[0]},{text[1:]}"
+    if ODDS_VALUE.match(text):
+        return text.replace('.', ',')
+    if TIME_VALUE.match(text):
+        return text
+    return None
+
+
+def crop_word(image, word, padding):
+    top = max(word['top'] - padding, 0)
+    left = max(word['left'] - padding, 0)
+    bottom = word['top'] + word['height'] + padding
+    right = word['left'] + word['width'] + padding
+    return image[top:bottom, left:right]
+
+
+def batch_line(crops, gap_ratio):
+    """Colle les zones sur une seule ligne, séparées par du fond"""
+    height = max(crop.shape[0] for crop in crops)
+    background = int(np.median(np.concatenate([crop.ravel() for crop in crops])))
+    gap = np.full((height, max(int(height * gap_ratio), 8)), background, dtype=np.uint8)
+    parts = [gap]
+    for crop in crops:
+        if crop.shape[0] != height:
+            width = max(1, round(crop.shape[1] * height / crop.shape[0]))
+            crop = cv2.resize(crop, (width, height), interpolation=cv2.INTER_CUBIC)
+        parts.extend([crop, gap])
+    return np.hstack(parts)
+
+
+def read_digits(crops, settings=None):
+    """Relit les zones numériques : un appel groupé, appels unitaires si le
+    nombre de valeurs lues ne correspond pas au nombre de zones"""
+    settings = settings or config.OCR_DIGIT_PASS
+    engine = get_engine(tess_config=digit_config(settings))
+    values = engine.image_to_string(batch_line(crops, settings['gap_ratio'])).split()
+    if len(values) == len(crops):
+        return values
+    return [engine.image_to_string(crop).strip() for crop in crops]
+
+
+def words_to_lines(words):
+    """Lignes reconstituées à partir des mots : (texte, haut, bas) en pixels"""
+    lines = []
+    current = None
+    for word in words:
+        if word['line'] != current:
+            lines.append([[], word['top'], word['top'] + word['height']])
+            current = word['line']
+        line = lines[-1]
+        line[0].append(word['text'])
+        line[1] = min(line[1], word['top'])
+        line[2] = max(line[2], word['top'] + word['height'])
+    return [(' '.join(texts), top, bottom) for texts, top, bottom in lines]
+
+
+def words_to_text(words):
+    """Texte ligne par ligne reconstitué à partir des mots"""
+    return '\n'.join(text for text, _, _ in words_to_lines(words))
+
+
+def ocr_lines(image, engine=None, settings=None):
+    """Lignes OCR positionnées d'une image prétraitée, cotes et heures relues en chiffres"""
+    settings = settings or config.OCR_DIGIT_PASS
+    engine = engine or get_engine()
+    words = engine.image_to_data(image)
+    if not settings['enabled']:
+        return words_to_lines(words)
+
+    candidates = [w for w in words if is_candidate(w['text'])]
+    crops = [crop_word(image, w, settings['padding']) for w in candidates]
+    crops = [(w, c) for w, c in zip(candidates, crops) if c.size]
+    if crops:
+        values = read_digits([c for _, c in crops], settings)
+        for (word, _), value in zip(crops, values):
+            corrected = normalize_number(value, word['text'])
+            if corrected:
+                word['text'] = corrected
+
+    return words_to_lines(words)
+
+
+def ocr_with_digit_pass(image, engine=None, settings=None):
+    """Texte OCR d'une image prétraitée, cotes et heures relues en chiffres"""
+    settings = settings or config.OCR_DIGIT_PASS
+    engine = engine or get_engine()
+    if not settings['enabled']:
+        return engine.image_to_string(image)
+    return '\n'.join(text for text, _, _ in ocr_lines(image, engine, settings))
@@ -0,0 +1,166 @@
+"""
+Moteurs OCR : API Tesseract gardée en mémoire, ou pytesseract en repli
+
+pytesseract lance un processus `tesseract`, écrit des fichiers temporaires et
+recharge le modèle à chaque appel. Avec tesserocr, une API initialisée est
+conservée par thread (et par processus) et lit directement les images en
+mémoire. Le jeu de modèles (tessdata "fast" ou "best") est sélectionnable.
+"""
+import os
+import re
+import threading
+import numpy as np
+from PIL import Image
+import pytesseract
+import config
+
+try:
+    import tesserocr
+    HAS_TESSEROCR = True
+except ImportError:
+    HAS_TESSEROCR = False
+
+
+def parse_tesseract_config(tess_config):
+    """Options d'une ligne de commande Tesseract (--psm, --oem, -l, -c)"""
+    options = {'lang': 'fra', 'psm': 6, 'oem': 3, 'variables': {}}
+    match = re.search(r'--psm\s+(\d+)', tess_config)
+    if match:
+        options['psm'] = int(match.group(1))
+    match = re.search(r'--oem\s+(\d+)', tess_config)
+    if match:
+        options['oem'] = int(match.group(1))
+    match = re.search(r'-l\s+(\S+)', tess_config)
+    if match:
+        options['lang'] = match.group(1)
+    for key, value in re.findall(r'-c\s+(\w+)=(\S+)', tess_config):
+        options['variables'][key] = value
+    return options
+
+
+def _to_pil(image):
+    if isinstance(image, np.ndarray):
+        return Image.fromarray(image)
+    return image
+
+
+class PytesseractEngine:
+    """Un processus tesseract par appel (compatible partout)"""
+
+    name = 'pytesseract'
+
+    def __init__(self, tess_config=None, tessdata_dir=None):
+        self.tess_config = tess_config or config.TESSERACT_CONFIG
+        if tessdata_dir:
+            self.tess_config += f' --tessdata-dir "{tessdata_dir}"'
+
+    def image_to_string(self, image):
+        return pytesseract.image_to_string(_to_pil(image), config=self.tess_config)
+
+    def image_to_data(self, image):
+        """Mots reconnus avec leur boîte, dans l'ordre de lecture"""
+        data = pytesseract.image_to_data(
+            _to_pil(image), config=self.tess_config, output_type=pytesseract.Output.DICT
+        )
+        words = []
+        for i, text in enumerate(data['text']):
+            if not text.strip():
+                continue
+            words.append({
+                'text': text,
+                'left': data['left'][i],
+                'top': data['top'][i],
+                'width': data['width'][i],
+                'height': data['height'][i],
+                'conf': float(data['conf'][i]),
+                'line': (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            })
+        return words
+
+    def close(self):
+        pass
+
+
+class TesserocrEngine:
+    """API Tesseract initialisée une fois puis réutilisée"""
+
+    name = 'tesserocr'
+
+    def __init__(self, tess_config=None, tessdata_dir=None):
+        options = parse_tesseract_config(tess_config or config.TESSERACT_CONFIG)
+        kwargs = {
+            'lang': options['lang'],
+            'psm': options['psm'],
+            'oem': options['oem']
+        }
+        if tessdata_dir:
+            kwargs['path'] = tessdata_dir
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+        for key, value in options['variables'].items():
+            self.api.SetVariable(key, value)
+
+    def image_to_string(self, image):
+        self.api.SetImage(_to_pil(image))
+        return self.api.GetUTF8Text()
+
+    def image_to_data(self, image):
+        """Mots reconnus avec leur boîte, dans l'ordre de lecture"""
+        self.api.SetImage(_to_pil(image))
+        self.api.Recognize()
+        words = []
+        line = 0
+        iterator = self.api.GetIterator()
+        for word in tesserocr.iterate_level(iterator, tesserocr.RIL.WORD):
+            if word.IsAtBeginningOf(tesserocr.RIL.TEXTLINE):
+                line += 1
+            text = word.GetUTF8Text(tesserocr.RIL.WORD)
+            box = word.BoundingBox(tesserocr.RIL.WORD)
+            if not text or not text.strip() or box is None:
+                continue
+            left, top, right, bottom = box
+            words.append({
+                'text': text,
+                'left': left,
+                'top': top,
+                'width': right - left,
+                'height': bottom - top,
+                'conf': word.Confidence(tesserocr.RIL.WORD),
+                'line': line
+            })
+        return words
+
+    def close(self):
+        self.api.End()
+
+
+_local = threading.local()
+
+
+def get_engine(tess_config=None, model=None, engine=None):
+    """Moteur OCR du thread courant, créé au premier appel puis réutilisé
+
+    Les moteurs sont rangés par processus : un fork (pool de processus)
+    recrée le sien au lieu d'hériter d'une API du parent.
+    """
+    tess_config = tess_config or config.TESSERACT_CONFIG
+    model = model or config.OCR_MODEL
+    engine = engine or config.OCR_ENGINE
+
+    if getattr(_local, 'pid', None) != os.getpid():
+        _local.pid = os.getpid()
+        _local.engines = {}
+
+    key = (engine, model, tess_config)
+    if key not in _local.engines:
+        tessdata_dir = config.TESSDATA_DIRS.get(model)
+        use_tesserocr = engine == 'tesserocr' or (engine == 'auto' and HAS_TESSEROCR)
+        if use_tesserocr:
+            try:
+                _local.engines[key] = TesserocrEngine(tess_config, tessdata_dir)
+            except Exception as e:
+                print(f"⚠️ tesserocr indisponible ({e}), repli sur pytesseract")
+                use_tesserocr = False
+        if not use_tesserocr:
+            _local.engines[key] = PytesseractEngine(tess_config, tessdata_dir)
+
+    return _local.engines[key]
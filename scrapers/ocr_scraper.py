@@ -1,82 +1,114 @@
 """
 Scraper utilisant OCR (Tesseract) pour extraire les cotes depuis des screenshots
 """
-import re
 import asyncio
+import re
 from datetime import datetime
-from PIL import Image
-import pytesseract
 import cv2
 import numpy as np
-from playwright.async_api import async_playwright
 import config
+from .browser_pool import BrowserPool, url_slug
+from .resource_blocker import ResourceBlocker
+from .readiness import ReadinessWaiter
+from .dom_extraction import card_boxes_async, card_texts_async, build_cotes
+from .card_parser import parse_card
+from .preprocessing import preprocess
+from .ocr_tiling import TiledOCR
+from .ocr_digits import ocr_with_digit_pass
+from .ocr_cache import image_key, default_cache
+from .change_detection import page_key
+from utils.image_writer import image_writer
+from utils.models import OddsBatch
+from utils.fuzzy_index import dedupe_odds
 
 
 class OCRScraper:
-    def __init__(self, headless=None):
+    def __init__(self, headless=None, pool=None, mode=None, detector=None, urls=None):
         self.headless = headless if headless is not None else config.HEADLESS
+        self.pool = pool
+        self.detector = detector
+        self.urls = urls or config.TARGET_URLS
+        self.unchanged = False
+        self.unchanged_urls = []
+        self.mode = mode or config.OCR_MODE
+        self.blocker = ResourceBlocker(
+            resource_types=config.RESOURCE_BLOCKING['ocr_resource_types']
+        )
+        self.network_stats = {}
+        self.waiter = ReadinessWaiter()
+        self.cache = default_cache()
     
-    def preprocess_image(self, image_path):
-        """Prétraitement de l'image pour améliorer l'OCR"""
-        # Lire l'image
-        img = cv2.imread(str(image_path))
-        
-        # Convertir en niveaux de gris
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Agrandir l'image
-        if config.OCR_PREPROCESSING['scale_factor'] > 1:
-            scale = config.OCR_PREPROCESSING['scale_factor']
-            width = int(gray.shape[1] * scale)
-            height = int(gray.shape[0] * scale)
-            gray = cv2.resize(gray, (width, height), interpolation=cv2.INTER_CUBIC)
-        
-        # Réduction du bruit
-        if config.OCR_PREPROCESSING['denoise']:
-            gray = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-        
-        # Binarisation adaptative
-        if config.OCR_PREPROCESSING['threshold']:
-            gray = cv2.adaptiveThreshold(
-                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                cv2.THRESH_BINARY, 11, 2
-            )
-        
-        # Sauvegarder l'image prétraitée
-        preprocessed_path = config.SCREENSHOTS_DIR / f"preprocessed_{datetime.now().strftime(config.DATETIME_FORMAT)}.png"
-        cv2.imwrite(str(preprocessed_path), gray)
-        
-        return preprocessed_path
+    def preprocess_array(self, img):
+        """Prétraitement d'une image déjà en mémoire (BGR ou niveaux de gris)"""
+        return preprocess(img)
+    
+    def decode_screenshot(self, png, flags=cv2.IMREAD_COLOR):
+        """Décode directement les octets PNG d'un screenshot en tableau NumPy"""
+        return cv2.imdecode(np.frombuffer(png, dtype=np.uint8), flags)
     
-    def extract_text_from_image(self, image_path):
-        """Extrait le texte d'une image avec Tesseract"""
+    def extract_text_from_image(self, image):
+        """Extrait le texte d'une image (tableau NumPy ou chemin) avec Tesseract"""
         try:
-            # Prétraiter l'image
-            preprocessed = self.preprocess_image(image_path)
+            if not isinstance(image, np.ndarray):
+                image = cv2.imread(str(image), cv2.IMREAD_GRAYSCALE)
             
-            # Utiliser Tesseract
-            text = pytesseract.image_to_string(
-                Image.open(preprocessed),
-                lang='fra',
-                config=config.TESSERACT_CONFIG
-            )
+            if config.OCR_TILING['enabled']:
+                # Bandes traitées en parallèle, mémoire bornée par bande
+                return TiledOCR(cache=self.cache).run(image)
             
-            return text
+            return ocr_with_digit_pass(self.preprocess_array(image))
         
         except Exception as e:
             print(f"❌ Erreur OCR: {e}")
             return ""
     
+    def ocr_cards(self, crops):
+        """OCR carte par carte : une image de carte donne une cote"""
+        cards = []
+        for png in crops:
+            try:
+                img = self.decode_screenshot(png, cv2.IMREAD_GRAYSCALE)
+                # Carte déjà lue lors d'un run précédent : pas de Tesseract
+                key = image_key(img) if self.cache else None
+                entry = self.cache.get(key) if self.cache else None
+                if entry:
+                    cards.append(dict(entry['fields']))
+                    continue
+                text = ocr_with_digit_pass(self.preprocess_array(img))
+            except Exception as e:
+                print(f"⚠️ Erreur OCR carte: {e}")
+                continue
+            lines = [l.strip() for l in text.split('\n') if l.strip()]
+            fields = parse_card(lines)
+            if self.cache:
+                self.cache.put(key, text, fields)
+            cards.append(fields)
+        
+        return build_cotes(cards, 'ocr')
+    
+    def accept(self, cotes, url=None):
+        """Retient l'empreinte de la page si l'OCR a trouvé des cotes"""
+        if cotes and self.detector:
+            self.detector.accept(page_key('ocr', url or config.TARGET_URL))
+    
+    def save_cache(self):
+        """Persiste le cache OCR et affiche ses compteurs"""
+        if self.cache is None:
+            return
+        self.cache.report()
+        try:
+            self.cache.save()
+        except OSError as e:
+            print(f"⚠️ Cache OCR non sauvegardé: {e}")
+    
     def parse_ocr_text(self, text):
         """Parse le texte OCR pour extraire les données structurées"""
-        cotes = []
+        cotes = OddsBatch()
         
         # Diviser par lignes
         lines = [l.strip() for l in text.split('\n') if l.strip()]
         
         current_cote = {
-            'timestamp': datetime.now().isoformat(),
-            'method': 'ocr',
             'heure': '',
             'sport': '',
             'description': '',
@@ -89,10 +121,8 @@ class OCRScraper:
             if re.search(r'(COTE.*BOOST|BOOST.*COTE)', line, re.I):
                 # Sauvegarder la cote précédente si complète
                 if current_cote['cote_boostee']:
-                    cotes.append(current_cote.copy())
+                    cotes.add(current_cote, 'ocr')
                     current_cote = {
-                        'timestamp': datetime.now().isoformat(),
-                        'method': 'ocr',
                         'heure': '',
                         'sport': '',
                         'description': '',
@@ -126,58 +156,116 @@ class OCRScraper:
         
         # Ajouter la dernière cote
         if current_cote['cote_boostee']:
-            cotes.append(current_cote)
+            cotes.add(current_cote, 'ocr')
         
         return cotes
     
-    async def capture_screenshot(self):
-        """Capture un screenshot de la page"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=self.headless)
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080}
-            )
-            page = await context.new_page()
+    async def capture_async(self, pool=None, url=None):
+        """Capture les cartes (mode "roi") ou, à défaut, la page entière
+
+        Retourne (images PNG des cartes, octets PNG de la page entière) ;
+        ([], None) si la page n'a pas changé depuis le dernier run.
+        """
+        pool = pool or self.pool
+        url = url or config.TARGET_URL
+        async with pool.page() as page:
+            await self.blocker.attach_async(page)
+            await page.goto(url, wait_until='networkidle')
+            await self.waiter.wait_async(page)
             
-            try:
-                await page.goto(config.TARGET_URL, wait_until='networkidle')
-                await page.wait_for_timeout(config.DELAY * 1000)
-                
-                # Scroll
-                for _ in range(3):
-                    await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                    await page.wait_for_timeout(1000)
-                
-                # Screenshot
-                timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
-                screenshot_path = config.SCREENSHOTS_DIR / f"ocr_{timestamp}.png"
-                await page.screenshot(path=str(screenshot_path), full_page=True)
-                
-                return screenshot_path
+            # Scroll
+            await self.waiter.scroll_async(page)
+            
+            # Page identique au dernier run : ni capture ni OCR
+            if self.detector and self.detector.unchanged(page_key('ocr', url), await card_texts_async(page)):
+                self.unchanged_urls.append(url)
+                return [], None
+            
+            # Ne capturer que les cartes repérées dans le DOM
+            crops = []
+            if self.mode == 'roi':
+                for box in await card_boxes_async(page):
+                    crops.append(await page.screenshot(clip=box, full_page=True))
+                print(f"🎯 {len(crops)} cartes capturées ({url_slug(url)})")
+            
+            # Screenshot pleine page si aucune carte n'a été localisée
+            screenshot = None
+            if not crops:
+                screenshot = await page.screenshot(full_page=True)
             
-            finally:
-                await browser.close()
+            return crops, screenshot
+    
+    def process(self, crops, screenshot, url=None):
+        """OCR des captures (cartes ou page entière) d'une page -> cotes"""
+        if not crops and screenshot is None:
+            return OddsBatch()
+        
+        if crops:
+            print("👁️ OCR des cartes...")
+            cotes = self.ocr_cards(crops)
+            self.accept(cotes, url)
+            return cotes
+        
+        # Sauvegarde éventuelle en arrière-plan, l'OCR travaille en mémoire
+        timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
+        screenshot_path = image_writer.save(
+            screenshot, config.SCREENSHOTS_DIR / f"ocr_{timestamp}_{url_slug(url or config.TARGET_URL)}.png"
+        )
+        if screenshot_path:
+            print(f"📸 Screenshot: {screenshot_path}")
+        
+        # Extraire le texte
+        print("👁️ Extraction du texte avec OCR...")
+        text = self.extract_text_from_image(
+            self.decode_screenshot(screenshot, cv2.IMREAD_GRAYSCALE)
+        )
+        
+        # Parser les données
+        cotes = self.parse_ocr_text(text)
+        self.accept(cotes, url)
+        
+        return cotes
+    
+    def process_all(self, captures):
+        """OCR des captures de toutes les pages (une à la fois, le cache est partagé)"""
+        batches = [self.process(crops, screenshot, url) for url, (crops, screenshot) in captures]
+        self.save_cache()
+        # Un même boost peut figurer sur plusieurs pages
+        return dedupe_odds(OddsBatch.concat(batches))
+    
+    async def scrape_async(self, pool=None):
+        """Captures en parallèle sur la boucle du pool, OCR dans un thread (la boucle reste libre)"""
+        pool = pool or self.pool
+        try:
+            self.waiter.reset()
+            self.unchanged_urls = []
+            self.blocker.reset()
+            shots = await pool.crawl_async(self.urls, lambda url: self.capture_async(pool, url))
+            self.waiter.report()
+            self.network_stats = self.blocker.report()
+            self.unchanged = len(self.unchanged_urls) == len(self.urls)
+            
+            captures = [(url, shot) for url, shot in zip(self.urls, shots) if shot is not None]
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.process_all, captures)
+        except Exception as e:
+            print(f"❌ Erreur OCR Scraper: {e}")
+            import traceback
+            traceback.print_exc()
+            return OddsBatch()
     
     def scrape(self):
         """Scrape avec OCR"""
         try:
             print("🚀 Démarrage du scraping avec OCR...")
+            if self.pool is not None:
+                return self.pool.run(self.scrape_async())
             
-            # Capturer un screenshot
-            screenshot_path = asyncio.run(self.capture_screenshot())
-            print(f"📸 Screenshot: {screenshot_path}")
-            
-            # Extraire le texte
-            print("👁️ Extraction du texte avec OCR...")
-            text = self.extract_text_from_image(screenshot_path)
-            
-            # Parser les données
-            cotes = self.parse_ocr_text(text)
-            
-            return cotes
+            with BrowserPool(headless=self.headless) as pool:
+                return pool.run(self.scrape_async(pool))
         
         except Exception as e:
             print(f"❌ Erreur OCR Scraper: {e}")
             import traceback
             traceback.print_exc()
-            return []
+            return OddsBatch()
@@ -0,0 +1,152 @@
+"""
+OCR par bandes d'un screenshot pleine page, sur tous les cœurs
+
+Le screenshot est découpé en bandes horizontales qui se chevauchent ; chaque
+bande est prétraitée et lue par Tesseract dans un pool de processus, puis les
+lignes sont recollées d'après leur position verticale dans la page : seule
+une ligne de même texte à la même hauteur dans la zone de chevauchement est
+un doublon (deux cartes voisines aux cotes identiques restent distinctes). La hauteur des bandes est choisie pour borner la mémoire de
+travail de chaque bande.
+"""
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import config
+from .preprocessing import preprocess, default_pipeline
+from .ocr_digits import ocr_lines
+from .ocr_cache import image_key
+
+
+# Nombre de copies de travail d'une bande pendant le prétraitement
+WORKING_COPIES = 4
+# Une ligne à moins de EDGE_PX du bas de sa bande est considérée comme coupée
+EDGE_PX = 2
+
+
+def tile_height(width, settings=None):
+    """Hauteur (pixels source) d'une bande respectant le plafond mémoire"""
+    settings = settings or config.OCR_TILING
+    scale = max(default_pipeline().scale, 1)
+    bytes_per_row = width * scale * scale * WORKING_COPIES
+    rows = int(settings['max_tile_mb'] * 1024 * 1024 / bytes_per_row)
+    return max(rows, settings['overlap_px'] * 4)
+
+
+def split_strips(gray, height, overlap):
+    """Bornes (haut, bas) des bandes, coupées sur la ligne la plus vide"""
+    total = gray.shape[0]
+    strips = []
+    top = 0
+    while top < total:
+        bottom = top + height
+        if bottom >= total:
+            strips.append((top, total))
+            break
+        # Couper sur la ligne la plus uniforme de la zone de chevauchement
+        window = gray[bottom - overlap:bottom]
+        cut = bottom - overlap + int(np.argmin(window.std(axis=1)))
+        strips.append((top, min(cut + overlap, total)))
+        top = cut
+    return strips
+
+
+def _normalize(line):
+    return re.sub(r'\s+', ' ', line).strip().lower()
+
+
+def _same_line(a, b):
+    """Même texte et même hauteur (centres à moins d'une demi-ligne)"""
+    tolerance = max(a[2] - a[1], b[2] - b[1]) / 2
+    return _normalize(a[0]) == _normalize(b[0]) and abs((a[1] + a[2]) - (b[1] + b[2])) / 2 <= tolerance
+
+
+def stitch(strips):
+    """Recolle les lignes des bandes sans doublons dus au chevauchement
+
+    `strips` : [(haut, bas, lignes)] avec des lignes (texte, haut, bas) en
+    pixels de la page. Une ligne qui touche le bas de sa bande (coupée) est
+    remplacée par la lecture complète de la bande suivante.
+    """
+    kept = []
+    previous_bottom = None
+    for top, bottom, lines in strips:
+        if previous_bottom is not None:
+            kept = [
+                line for line in kept
+                if not (line[2] >= previous_bottom - EDGE_PX and line[1] >= top)
+            ]
+            overlap = [line for line in kept if line[2] > top]
+        for line in lines:
+            if previous_bottom is not None and line[1] < previous_bottom and any(
+                _same_line(line, other) for other in overlap
+            ):
+                continue
+            kept.append(line)
+        previous_bottom = bottom
+    return '\n'.join(text for text, _, _ in kept if text.strip())
+
+
+def ocr_strip(strip):
+    """Prétraite et lit une bande (exécuté dans un processus du pool)
+
+    Chaque processus garde son propre moteur OCR initialisé. Retourne les
+    lignes (texte, haut, bas) en pixels de la bande.
+    """
+    processed = preprocess(strip)
+    scale = processed.shape[0] / strip.shape[0]
+    return [(text, top / scale, bottom / scale) for text, top, bottom in ocr_lines(processed)]
+
+
+def process_context(settings=None):
+    """Contexte multiprocessing du pool (repli sur spawn si la méthode manque)"""
+    settings = settings or config.OCR_TILING
+    method = settings['start_method']
+    if method not in multiprocessing.get_all_start_methods():
+        method = 'spawn'
+    return multiprocessing.get_context(method)
+
+
+class TiledOCR:
+    """OCR d'une grande image découpée en bandes traitées en parallèle"""
+
+    def __init__(self, workers=None, settings=None, cache=None):
+        self.settings = settings or config.OCR_TILING
+        self.workers = workers or self.settings['workers'] or os.cpu_count() or 1
+        self.cache = cache
+
+    def run(self, gray):
+        """Texte d'une image en niveaux de gris"""
+        height = tile_height(gray.shape[1], self.settings)
+        bounds = split_strips(gray, height, self.settings['overlap_px'])
+        strips = [gray[top:bottom] for top, bottom in bounds]
+
+        # Bandes déjà lues lors d'un run précédent : lignes reprises du cache
+        results = [None] * len(strips)
+        keys = [image_key(strip) for strip in strips] if self.cache else []
+        for i, key in enumerate(keys):
+            entry = self.cache.get(key)
+            if entry and entry['fields'] and 'lines' in entry['fields']:
+                results[i] = [tuple(line) for line in entry['fields']['lines']]
+        todo = [i for i, lines in enumerate(results) if lines is None]
+        print(f"🧩 {len(strips)} bandes de {height}px, {len(todo)} à lire sur {min(self.workers, max(len(todo), 1))} processus")
+
+        if len(todo) <= 1 or self.workers == 1:
+            read = [ocr_strip(strips[i]) for i in todo]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(todo)),
+                                     mp_context=process_context(self.settings)) as executor:
+                read = list(executor.map(ocr_strip, [strips[i] for i in todo]))
+
+        for i, lines in zip(todo, read):
+            results[i] = lines
+            if self.cache:
+                text = '\n'.join(line[0] for line in lines)
+                self.cache.put(keys[i], text, {'lines': [list(line) for line in lines]})
+
+        # Positions ramenées dans le repère de la page
+        return stitch([
+            (top, bottom, [(text, top + y0, top + y1) for text, y0, y1 in lines])
+            for (top, bottom), lines in zip(bounds, results)
+        ])
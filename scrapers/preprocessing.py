@@ -0,0 +1,133 @@
+"""
+Prétraitement des images avant OCR, sous forme de pipeline composable
+
+Un pipeline est une liste d'étapes décrites par des chaînes "nom:arg:arg",
+par exemple ["upscale:cubic:2", "denoise:median", "threshold:otsu"]. L'image
+est toujours convertie en niveaux de gris avant la première étape.
+"""
+import cv2
+import numpy as np
+import config
+
+
+INTERPOLATIONS = {
+    'nearest': cv2.INTER_NEAREST,
+    'linear': cv2.INTER_LINEAR,
+    'cubic': cv2.INTER_CUBIC,
+    'lanczos': cv2.INTER_LANCZOS4,
+    'area': cv2.INTER_AREA
+}
+
+
+def _upscale(gray, method='cubic', factor='2'):
+    factor = float(factor)
+    if factor == 1:
+        return gray
+    width = int(gray.shape[1] * factor)
+    height = int(gray.shape[0] * factor)
+    return cv2.resize(gray, (width, height), interpolation=INTERPOLATIONS[method])
+
+
+def _denoise(gray, method='nlm'):
+    if method == 'median':
+        return cv2.medianBlur(gray, 3)
+    if method == 'bilateral':
+        return cv2.bilateralFilter(gray, 5, 50, 50)
+    if method == 'gaussian':
+        return cv2.GaussianBlur(gray, (3, 3), 0)
+    return cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+
+
+def _threshold(gray, method='adaptive'):
+    if method == 'otsu':
+        return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY, 11, 2
+    )
+
+
+def _invert(gray):
+    return cv2.bitwise_not(gray)
+
+
+def _contrast(gray, factor='2'):
+    # Même calcul que PIL.ImageEnhance.Contrast (pixel pour pixel) : moyenne
+    # arrondie à l'entier, mélange en float32 puis troncature
+    factor = np.float32(factor)
+    mean = np.float32(int(gray.mean() + 0.5))
+    blended = mean + factor * (gray.astype(np.float32) - mean)
+    return np.clip(blended, 0, 255).astype(np.uint8)
+
+
+STAGES = {
+    'upscale': _upscale,
+    'denoise': _denoise,
+    'threshold': _threshold,
+    'invert': _invert,
+    'contrast': _contrast
+}
+
+
+class Pipeline:
+    """Suite d'étapes de prétraitement appliquées à une image"""
+
+    def __init__(self, specs):
+        self.specs = list(specs)
+        self.stages = []
+        for spec in self.specs:
+            name, *args = spec.split(':')
+            if name not in STAGES:
+                raise ValueError(f"Étape de prétraitement inconnue: {spec}")
+            self.stages.append((STAGES[name], args))
+
+    @property
+    def scale(self):
+        """Facteur d'agrandissement total (pour dimensionner la mémoire)"""
+        scale = 1.0
+        for spec in self.specs:
+            name, *args = spec.split(':')
+            if name == 'upscale':
+                scale *= float(args[1]) if len(args) > 1 else 2.0
+        return scale
+
+    def __call__(self, img):
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        for stage, args in self.stages:
+            gray = stage(gray, *args)
+        return gray
+
+    def __repr__(self):
+        return ' > '.join(['grayscale'] + self.specs)
+
+
+def pipeline_from_settings(settings):
+    """Pipeline équivalent aux anciens réglages OCR_PREPROCESSING"""
+    specs = []
+    if settings['scale_factor'] > 1:
+        specs.append(f"upscale:cubic:{settings['scale_factor']}")
+    if settings['denoise']:
+        specs.append('denoise:nlm')
+    if settings['threshold']:
+        specs.append('threshold:adaptive')
+    return specs
+
+
+def default_pipeline():
+    """Pipeline configuré (OCR_PIPELINE, sinon OCR_PREPROCESSING)"""
+    if config.OCR_PIPELINE is not None:
+        return Pipeline(config.OCR_PIPELINE)
+    return Pipeline(pipeline_from_settings(config.OCR_PREPROCESSING))
+
+
+def preprocess(img, pipeline=None):
+    """Prétraite une image BGR ou en niveaux de gris pour Tesseract
+
+    `pipeline` est un Pipeline ou une liste d'étapes ; par défaut celui de
+    la configuration.
+    """
+    if pipeline is None:
+        pipeline = default_pipeline()
+    elif not isinstance(pipeline, Pipeline):
+        pipeline = Pipeline(pipeline)
+    return pipeline(img)
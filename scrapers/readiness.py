@@ -0,0 +1,165 @@
+"""
+Attente de la page sur des signaux réels plutôt que des pauses fixes
+
+La page est considérée prête quand les cartes "COTE BOOSTEE" sont présentes,
+que leur nombre ne bouge plus et que les cartes elles-mêmes sont silencieuses
+(MutationObserver), avec une borne haute absolue. Chaque attente est
+chronométrée, et la part des attentes terminées en 'timeout' est affichée.
+"""
+import asyncio
+import time
+import config
+from .dom_extraction import FIND_CARDS_JS
+
+
+# Fonction JS commune à Playwright (page.evaluate) et Selenium (execute_async_script)
+# Seules les mutations à l'intérieur des cartes comptent : scores et chronos en
+# direct ailleurs sur la page ne retardent pas l'attente.
+READY_JS = """
+(opts) => new Promise((resolve) => {
+""" + FIND_CARDS_JS + """
+    const start = performance.now();
+    const root = document.body || document.documentElement;
+
+    let cards = [];
+    let lastCount = -1;
+    let lastChange = start;
+    let lastMutation = start;
+    const inCard = (node) => cards.some((card) => card.contains(node));
+    const observer = new MutationObserver((records) => {
+        if (records.some((record) => inCard(record.target))) lastMutation = performance.now();
+    });
+    observer.observe(root, {childList: true, subtree: true, characterData: true});
+
+    let timer = null;
+    const finish = (reason) => {
+        observer.disconnect();
+        clearInterval(timer);
+        resolve({reason: reason, cards: lastCount, height: document.body.scrollHeight});
+    };
+
+    timer = setInterval(() => {
+        const now = performance.now();
+        cards = findCards(opts);
+        const count = cards.length;
+        if (count !== lastCount) {
+            lastCount = count;
+            lastChange = now;
+        }
+        const stableFor = now - lastChange;
+        if (count >= opts.minCards && stableFor >= opts.stableMs && now - lastMutation >= opts.quietMs) {
+            finish('ready');
+        } else if (count === 0 && stableFor >= opts.emptyQuietMs && document.readyState === 'complete') {
+            finish('empty');
+        } else if (now - start >= opts.timeoutMs) {
+            finish('timeout');
+        }
+    }, opts.pollMs);
+})
+"""
+
+SELENIUM_READY_JS = (
+    "const done = arguments[arguments.length - 1];"
+    f"({READY_JS})(arguments[0]).then(done);"
+)
+
+
+class ReadinessWaiter:
+    """Attend que la page soit prête et garde la trace de chaque attente"""
+
+    def __init__(self, timeout_ms=None):
+        self.settings = dict(config.READINESS)
+        if timeout_ms is not None:
+            self.settings['timeout_ms'] = timeout_ms
+        self.timings = []
+
+    def options(self, timeout_ms=None):
+        """Paramètres passés au script JS"""
+        return {
+            'pattern': self.settings['card_pattern'],
+            'minCards': 1,
+            'stableMs': self.settings['stable_ms'],
+            'quietMs': self.settings['quiet_ms'],
+            'emptyQuietMs': self.settings['empty_quiet_ms'],
+            'pollMs': self.settings['poll_ms'],
+            'timeoutMs': timeout_ms or self.settings['timeout_ms']
+        }
+
+    def reset(self):
+        """Oublie les attentes d'un scrape précédent"""
+        self.timings = []
+
+    def record(self, step, reason, started, cards=None):
+        """Enregistre la durée réelle d'une attente"""
+        timing = {
+            'step': step,
+            'reason': reason,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000),
+            'cards': cards
+        }
+        self.timings.append(timing)
+        return timing
+
+    def total_ms(self):
+        return sum(t['elapsed_ms'] for t in self.timings)
+
+    def timeouts(self):
+        """Nombre d'attentes arrivées à la borne haute"""
+        return sum(1 for t in self.timings if t['reason'] == 'timeout')
+
+    def report(self):
+        """Affiche le détail des attentes"""
+        details = ', '.join(
+            f"{t['step']}={t['elapsed_ms']}ms ({t['reason']})" for t in self.timings
+        )
+        print(f"⏱️ Attentes: {self.total_ms()}ms au total [{details}]")
+        if self.timeouts():
+            print(f"⚠️ {self.timeouts()}/{len(self.timings)} attentes terminées en timeout")
+        return self.timings
+
+    # --- Playwright ---------------------------------------------------------
+
+    async def wait_async(self, page, step='load', timeout_ms=None):
+        """Attend que la page Playwright soit prête"""
+        started = time.perf_counter()
+        try:
+            result = await page.evaluate(READY_JS, self.options(timeout_ms))
+        except Exception as e:
+            # Signal indisponible : on retombe sur la pause fixe historique
+            print(f"⚠️ Attente événementielle impossible ({e}), pause de {config.DELAY}s")
+            await asyncio.sleep(config.DELAY)
+            return self.record(step, 'fallback', started)
+        return self.record(step, result['reason'], started, result['cards'])
+
+    async def scroll_async(self, page):
+        """Scrolle jusqu'en bas tant que la page grandit"""
+        for i in range(self.settings['max_scrolls']):
+            height = await page.evaluate('document.body.scrollHeight')
+            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+            await self.wait_async(page, f'scroll_{i + 1}', self.settings['scroll_timeout_ms'])
+            if await page.evaluate('document.body.scrollHeight') == height:
+                break
+
+    # --- Selenium -----------------------------------------------------------
+
+    def wait(self, driver, step='load', timeout_ms=None):
+        """Attend que la page Selenium soit prête"""
+        options = self.options(timeout_ms)
+        started = time.perf_counter()
+        try:
+            driver.set_script_timeout(options['timeoutMs'] / 1000 + 5)
+            result = driver.execute_async_script(SELENIUM_READY_JS, options)
+        except Exception as e:
+            print(f"⚠️ Attente événementielle impossible ({e}), pause de {config.DELAY}s")
+            time.sleep(config.DELAY)
+            return self.record(step, 'fallback', started)
+        return self.record(step, result['reason'], started, result['cards'])
+
+    def scroll(self, driver):
+        """Scrolle jusqu'en bas tant que la page grandit"""
+        for i in range(self.settings['max_scrolls']):
+            height = driver.execute_script("return document.body.scrollHeight")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self.wait(driver, f'scroll_{i + 1}', self.settings['scroll_timeout_ms'])
+            if driver.execute_script("return document.body.scrollHeight") == height:
+                break
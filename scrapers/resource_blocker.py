@@ -0,0 +1,167 @@
+"""
+Blocage des ressources inutiles (images, polices, vidéos, trackers) au chargement
+"""
+import json
+from collections import Counter
+from fnmatch import fnmatch
+import config
+
+
+# Correspondance type de ressource -> motifs d'URL, pour Selenium (CDP
+# Network.setBlockedURLs ne filtre que par URL)
+RESOURCE_TYPE_URL_PATTERNS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "m3u8", "mp3", "ogg"]
+}
+
+# Types CDP (Network.ResourceType) -> types Playwright
+CDP_RESOURCE_TYPES = {
+    "Image": "image",
+    "Font": "font",
+    "Media": "media",
+    "Script": "script",
+    "Stylesheet": "stylesheet",
+    "XHR": "xhr",
+    "Fetch": "fetch",
+    "Document": "document"
+}
+
+
+def chromium_args(extra=None):
+    """Arguments de lancement Chromium selon le profil configuré"""
+    args = list(extra if extra is not None else config.CHROMIUM_ARGS)
+    if config.BROWSER_PROFILE == 'lean':
+        args += [a for a in config.LEAN_CHROMIUM_ARGS if a not in args]
+    return args
+
+
+class ResourceBlocker:
+    """Intercepte les requêtes et bloque celles dont le parsing n'a pas besoin"""
+
+    def __init__(self, resource_types=None, url_patterns=None, enabled=None):
+        settings = config.RESOURCE_BLOCKING
+        self.enabled = settings['enabled'] if enabled is None else enabled
+        self.resource_types = set(
+            settings['resource_types'] if resource_types is None else resource_types
+        )
+        self.url_patterns = list(
+            settings['url_patterns'] if url_patterns is None else url_patterns
+        )
+        self.reset()
+
+    def reset(self):
+        """Remet les compteurs à zéro (un run = un rapport)"""
+        self.blocked = Counter()
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+
+    def should_block(self, resource_type, url):
+        """Indique si une requête doit être bloquée"""
+        if resource_type in self.resource_types:
+            return True
+        return any(fnmatch(url, pattern) for pattern in self.url_patterns)
+
+    def _record_blocked(self, resource_type):
+        self.blocked[resource_type or 'other'] += 1
+
+    # --- Playwright ---------------------------------------------------------
+
+    async def attach_async(self, page):
+        """Installe le filtre sur une page Playwright
+
+        Les compteurs ne sont pas remis à zéro : un scrape peut ouvrir
+        plusieurs pages en parallèle avec le même bloqueur, il appelle
+        `reset()` une fois au début du run.
+        """
+        if not self.enabled:
+            return
+        await page.route('**/*', self._handle_route)
+        page.on('response', self._on_response)
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self._record_blocked(request.resource_type)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _on_response(self, response):
+        self.loaded_requests += 1
+        length = response.headers.get('content-length', '')
+        if length.isdigit():
+            self.loaded_bytes += int(length)
+
+    # --- Selenium -----------------------------------------------------------
+
+    def selenium_patterns(self):
+        """Motifs d'URL équivalents aux types bloqués, pour Network.setBlockedURLs"""
+        patterns = list(self.url_patterns)
+        for resource_type in self.resource_types:
+            for ext in RESOURCE_TYPE_URL_PATTERNS.get(resource_type, []):
+                patterns += [f"*.{ext}", f"*.{ext}?*"]
+        return patterns
+
+    def attach_selenium(self, driver):
+        """Installe le filtre sur un driver Selenium via CDP"""
+        self.reset()
+        if not self.enabled:
+            return
+        try:
+            # Vider les logs d'un éventuel scrape précédent (driver réutilisé)
+            driver.get_log('performance')
+        except Exception:
+            pass
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.selenium_patterns()})
+        except Exception as e:
+            print(f"⚠️ Blocage des ressources indisponible: {e}")
+
+    def collect_selenium(self, driver):
+        """Compte les requêtes bloquées/chargées à partir des logs de performance"""
+        try:
+            logs = driver.get_log('performance')
+        except Exception:
+            return
+
+        for entry in logs:
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            params = message.get('params', {})
+            if message.get('method') == 'Network.loadingFailed' and params.get('blockedReason'):
+                self._record_blocked(CDP_RESOURCE_TYPES.get(params.get('type'), 'other'))
+            elif message.get('method') == 'Network.loadingFinished':
+                self.loaded_requests += 1
+                self.loaded_bytes += int(params.get('encodedDataLength', 0))
+
+    # --- Rapport ------------------------------------------------------------
+
+    def summary(self):
+        """Statistiques du dernier run"""
+        estimates = config.BLOCKED_BYTES_ESTIMATE
+        saved_bytes = sum(
+            count * estimates.get(resource_type, estimates['other'])
+            for resource_type, count in self.blocked.items()
+        )
+        return {
+            'blocked_requests': sum(self.blocked.values()),
+            'blocked_by_type': dict(self.blocked),
+            'estimated_bytes_saved': saved_bytes,
+            'loaded_requests': self.loaded_requests,
+            'loaded_bytes': self.loaded_bytes
+        }
+
+    def report(self):
+        """Affiche et retourne les statistiques du dernier run"""
+        stats = self.summary()
+        if self.enabled:
+            print(
+                f"🚫 {stats['blocked_requests']} requêtes bloquées "
+                f"(~{stats['estimated_bytes_saved'] / 1024:.0f} Ko économisés), "
+                f"{stats['loaded_requests']} chargées ({stats['loaded_bytes'] / 1024:.0f} Ko)"
+            )
+        return stats
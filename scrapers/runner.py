@@ -0,0 +1,71 @@
+"""
+Exécution concurrente des méthodes de scraping (--method all)
+
+Playwright, l'OCR et le réseau tournent en parallèle sur la boucle asyncio du
+BrowserPool (un seul Chromium, une page chacun) ; Selenium, synchrone, tourne
+dans un thread. Un sémaphore borne le nombre de méthodes actives. Les
+résultats sont transmis dès qu'une méthode termine et la durée de chaque
+méthode est mesurée : un run complet dure à peu près le temps de la plus
+lente au lieu de la somme.
+"""
+import asyncio
+import time
+import config
+from utils.models import OddsBatch
+
+
+class ConcurrentRunner:
+    """Lance plusieurs scrapers en parallèle sur la boucle du pool"""
+
+    def __init__(self, pool, max_concurrency=None):
+        self.pool = pool
+        self.max_concurrency = max_concurrency or config.CONCURRENCY['max_methods']
+        self.timings = {}
+
+    async def _timed(self, name, semaphore, job):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                data = await job()
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                data = OddsBatch()
+            self.timings[name] = time.perf_counter() - started
+            return name, data
+
+    @staticmethod
+    def _job(scraper, pool):
+        """Coroutine d'un scraper : native si async, sinon dans un thread"""
+        if hasattr(scraper, 'scrape_async'):
+            return lambda: scraper.scrape_async(pool)
+        return lambda: asyncio.get_running_loop().run_in_executor(None, scraper.scrape)
+
+    async def run_async(self, scrapers, on_result=None):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._timed(name, semaphore, self._job(scraper, self.pool)))
+            for name, scraper in scrapers
+        ]
+        results = {}
+        for finished in asyncio.as_completed(tasks):
+            name, data = await finished
+            results[name] = data
+            if on_result is not None:
+                on_result(name, data, self.timings[name])
+        return results
+
+    def run(self, scrapers, on_result=None):
+        """Exécute [(nom, scraper), ...] ; `on_result(nom, cotes, durée)` à chaque fin
+
+        Retourne {nom: cotes}.
+        """
+        started = time.perf_counter()
+        results = self.pool.run(self.run_async(scrapers, on_result))
+        self.report(time.perf_counter() - started)
+        return results
+
+    def report(self, total):
+        print("\n⏱️ Durées par méthode:")
+        for name, elapsed in sorted(self.timings.items(), key=lambda item: item[1]):
+            print(f"   {name:<12} {elapsed:6.1f}s")
+        print(f"   {'total':<12} {total:6.1f}s (somme {sum(self.timings.values()):.1f}s)")
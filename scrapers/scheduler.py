@@ -0,0 +1,117 @@
+"""
+Planification adaptative des runs en mode veille (main.py --watch)
+
+Le délai avant le prochain run dépend :
+- du taux de changement récent (moyenne glissante des runs dont les cotes
+  extraites différaient du run précédent) : page active -> on rapproche les
+  runs, page figée (la nuit) -> on les espace ;
+- des heures de match des boosts affichés : à l'approche d'un coup d'envoi,
+  on garantit plusieurs passages avant le début du match.
+Le délai reste entre les bornes min/max et le nombre de runs sur une heure
+glissante ne dépasse pas le budget. Chaque décision est affichée et ajoutée
+au journal JSONL pour pouvoir régler les paramètres.
+"""
+import json
+from collections import deque
+from datetime import datetime, timedelta
+import config
+from .change_detection import fingerprint, cotes_parts
+
+
+class AdaptiveScheduler:
+    """Choisit l'heure du prochain run d'après les runs précédents"""
+
+    def __init__(self, settings=None, log_path=None):
+        self.settings = settings or config.SCHEDULER
+        self.log_path = log_path or config.CACHE_DIR / 'scheduler.jsonl'
+        self.change_rate = self.settings['initial_change_rate']
+        self.last_digest = None
+        self.kickoffs = []
+        self.runs = deque()
+
+    def observe(self, cotes, started_at=None):
+        """Enregistre un run : cotes extraites (vide si page inchangée ou échec)"""
+        started_at = started_at or datetime.now()
+        self.runs.append(started_at)
+
+        # Sans cotes, rien ne prouve un changement : la page est inchangée
+        # (détection de changement) ou le run a échoué
+        changed = False
+        if cotes:
+            digest = fingerprint(cotes_parts(cotes))
+            changed = self.last_digest is not None and digest != self.last_digest
+            self.last_digest = digest
+            self.kickoffs = sorted({cote.heure for cote in cotes if cote.heure is not None})
+
+        alpha = self.settings['change_smoothing']
+        self.change_rate = alpha * changed + (1 - alpha) * self.change_rate
+        return changed
+
+    def next_kickoff(self, now):
+        """Prochain coup d'envoi parmi les boosts affichés (None si aucun)"""
+        upcoming = []
+        for heure in self.kickoffs:
+            kickoff = datetime.combine(now.date(), heure)
+            # Une heure déjà passée de plus de 12 h désigne un match du lendemain
+            if kickoff < now - timedelta(hours=12):
+                kickoff += timedelta(days=1)
+            if kickoff >= now:
+                upcoming.append(kickoff)
+        return min(upcoming) if upcoming else None
+
+    def plan(self, now=None):
+        """Date du prochain run ; la décision est journalisée"""
+        now = now or datetime.now()
+        s = self.settings
+        min_s, max_s = s['min_interval_s'], s['max_interval_s']
+
+        # Interpolation géométrique : taux 0 -> max, taux 1 -> min
+        delay = max_s * (min_s / max_s) ** self.change_rate
+        reason = 'changements'
+
+        kickoff = self.next_kickoff(now)
+        if kickoff is not None:
+            until = (kickoff - now).total_seconds()
+            if until <= s['kickoff_window_min'] * 60:
+                near = until / s['polls_before_kickoff']
+                if near < delay:
+                    delay = near
+                    reason = 'coup d\'envoi'
+
+        delay = min(max(delay, min_s), max_s)
+        next_run = now + timedelta(seconds=delay)
+
+        # Budget : pas plus de N runs sur une heure glissante
+        while self.runs and self.runs[0] <= now - timedelta(hours=1):
+            self.runs.popleft()
+        if len(self.runs) >= s['runs_per_hour']:
+            budget_run = self.runs[-s['runs_per_hour']] + timedelta(hours=1)
+            if budget_run > next_run:
+                next_run = budget_run
+                reason = 'budget'
+
+        self.log(now, next_run, reason, kickoff)
+        return next_run
+
+    def log(self, now, next_run, reason, kickoff):
+        delay = (next_run - now).total_seconds()
+        kickoff_text = f", coup d'envoi {kickoff:%H:%M}" if kickoff else ''
+        print(
+            f"🗓️ Prochain run dans {delay / 60:.1f} min ({reason}; "
+            f"changements {self.change_rate:.0%}{kickoff_text}, "
+            f"budget {len(self.runs)}/{self.settings['runs_per_hour']} sur 1 h)"
+        )
+        decision = {
+            'at': now.isoformat(),
+            'next_run': next_run.isoformat(),
+            'delay_s': round(delay, 1),
+            'reason': reason,
+            'change_rate': round(self.change_rate, 3),
+            'next_kickoff': kickoff.isoformat() if kickoff else None,
+            'runs_last_hour': len(self.runs)
+        }
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(decision, ensure_ascii=False) + '\n')
+        except OSError as e:
+            print(f"⚠️ Journal de planification non écrit: {e}")
@@ -2,7 +2,6 @@
 Scraper utilisant Selenium pour extraire les cotes boostées
 """
 import time
-import re
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,17 +9,40 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
 import config
+from .resource_blocker import ResourceBlocker
+from .readiness import ReadinessWaiter
+from .dom_extraction import extract_cards, card_texts, build_cotes
+from .card_parser import extract_cotes
+from .browser_pool import url_slug
+from .change_detection import page_key
+from utils.image_writer import image_writer
+from utils.models import OddsBatch, format_odd
+from utils.fuzzy_index import dedupe_odds
 
 
 class SeleniumScraper:
-    def __init__(self, headless=None):
+    def __init__(self, headless=None, driver_pool=None, detector=None, urls=None):
         self.headless = headless if headless is not None else config.HEADLESS
+        self.driver_pool = driver_pool
+        self.detector = detector
+        self.urls = urls or config.TARGET_URLS
+        self.unchanged = False
+        self.unchanged_urls = []
         self.driver = None
+        self.blocker = ResourceBlocker()
+        self.network_stats = {}
+        self.waiter = ReadinessWaiter()
         
     def setup_driver(self):
-        """Configure le driver Selenium"""
+        """Configure le driver Selenium (réutilisé depuis le pool s'il y en a un)"""
+        if self.driver_pool is not None:
+            self.driver = self.driver_pool.acquire(self.create_driver)
+        else:
+            self.driver = self.create_driver()
+    
+    def create_driver(self):
+        """Lance un nouveau Chrome piloté par Selenium"""
         chrome_options = Options()
         
         if self.headless:
@@ -33,20 +55,28 @@ class SeleniumScraper:
         chrome_options.add_argument(f"user-agent={config.USER_AGENT}")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         
+        if config.BROWSER_PROFILE == 'lean':
+            for arg in config.LEAN_CHROMIUM_ARGS:
+                chrome_options.add_argument(arg)
+        
+        # Logs réseau pour le rapport des requêtes bloquées
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
         # Utiliser chromedriver du système (préinstallé sur GitHub Actions)
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
+            driver = webdriver.Chrome(options=chrome_options)
         except Exception as e:
             print(f"⚠️ Erreur avec le driver système: {e}")
             try:
                 from webdriver_manager.chrome import ChromeDriverManager
                 service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                driver = webdriver.Chrome(service=service, options=chrome_options)
             except Exception as e2:
                 print(f"❌ Erreur avec webdriver-manager: {e2}")
                 raise
         
-        self.driver.set_page_load_timeout(config.TIMEOUT)
+        driver.set_page_load_timeout(config.TIMEOUT)
+        return driver
     
     def accept_cookies(self):
         """Accepte les cookies si la popup apparaît"""
@@ -78,7 +108,7 @@ class SeleniumScraper:
                     
                     button.click()
                     print("✅ Cookies acceptés")
-                    time.sleep(2)  # Attendre que la popup disparaisse
+                    self.wait_popup_closed(button)
                     return True
                 except:
                     continue
@@ -88,7 +118,7 @@ class SeleniumScraper:
                 close_button = self.driver.find_element(By.CSS_SELECTOR, "button[aria-label='Close'], button.close, [class*='close']")
                 close_button.click()
                 print("✅ Popup fermée")
-                time.sleep(2)
+                self.wait_popup_closed(close_button)
                 return True
             except:
                 pass
@@ -100,146 +130,111 @@ class SeleniumScraper:
             print(f"ℹ️ Pas de popup de cookies détectée (c'est normal): {e}")
             return False
     
+    def wait_popup_closed(self, button):
+        """Attend que le bouton cliqué disparaisse (au plus 2s)"""
+        started = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, 2, poll_frequency=0.1).until(EC.invisibility_of_element(button))
+            self.waiter.record('cookies', 'closed', started)
+        except Exception:
+            self.waiter.record('cookies', 'timeout', started)
+    
     def scroll_page(self):
         """Scroll la page pour charger tout le contenu dynamique"""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        
-        for _ in range(3):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+        self.waiter.scroll(self.driver)
     
     def extract_cotes_data(self):
         """Extrait les données des cartes de cotes"""
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        cotes = []
+        cotes = extract_cotes(self.driver.page_source, 'selenium')
         
-        # Rechercher les éléments contenant "COTE BOOSTEE" ou "BOOST"
-        boost_elements = soup.find_all(string=re.compile(r'(COTE.*BOOST|BOOST.*COTE)', re.I))
+        for cote_data in cotes:
+            print(f"✅ Cote extraite: {format_odd(cote_data.cote_boostee)} - {cote_data.sport}")
         
-        if not boost_elements:
-            print("⚠️ Aucun élément 'COTE BOOSTEE' trouvé dans le HTML")
-            # Essayer de trouver des éléments avec des classes typiques
-            boost_elements = soup.find_all('div', class_=re.compile(r'boost|promo|featured', re.I))
+        return cotes
+    
+    def scrape_page(self, url):
+        """Charge une page dans le driver courant et en extrait les cotes"""
+        key = page_key('selenium', url)
+        self.waiter.reset()
         
-        print(f"🔍 Trouvé {len(boost_elements)} éléments potentiels")
+        print(f"📄 Chargement de {url}")
+        self.driver.get(url)
         
-        for element in boost_elements:
-            try:
-                # Remonter pour trouver le conteneur parent
-                card = None
-                if isinstance(element, str):
-                    card = element.find_parent('div', class_=lambda x: x and any(
-                        keyword in str(x).lower() for keyword in ['card', 'boost', 'bet', 'event']
-                    ))
-                else:
-                    card = element
-                
-                if not card:
-                    continue
-                
-                cote_data = {
-                    'timestamp': datetime.now().isoformat(),
-                    'method': 'selenium',
-                    'heure': '',
-                    'sport': '',
-                    'description': '',
-                    'cote_originale': '',
-                    'cote_boostee': ''
-                }
-                
-                card_text = card.get_text(separator=' ', strip=True)
-                
-                # Extraire l'heure (format HH:MM)
-                time_match = re.search(r'\b([0-2]?[0-9]:[0-5][0-9])\b', card_text)
-                if time_match:
-                    cote_data['heure'] = time_match.group(1)
-                
-                # Extraire toutes les cotes (format X,XX ou X.XX)
-                odds = re.findall(r'\b(\d+[,\.]\d{2})\b', card_text)
-                if len(odds) >= 2:
-                    cote_data['cote_originale'] = odds[0].replace('.', ',')
-                    cote_data['cote_boostee'] = odds[-1].replace('.', ',')
-                elif len(odds) == 1:
-                    cote_data['cote_boostee'] = odds[0].replace('.', ',')
-                
-                # Extraire le texte descriptif
-                lines = [l.strip() for l in card_text.split('\n') if l.strip()]
-                relevant_lines = []
-                
-                for line in lines:
-                    if (len(line) > 5 and 
-                        'COTE' not in line.upper() and 
-                        'BOOST' not in line.upper() and
-                        not re.match(r'^\d+[,\.]\d{2}$', line) and
-                        not re.match(r'^\d{1,2}:\d{2}$', line)):
-                        relevant_lines.append(line)
-                
-                if len(relevant_lines) >= 1:
-                    cote_data['sport'] = relevant_lines[0]
-                if len(relevant_lines) >= 2:
-                    cote_data['description'] = ' '.join(relevant_lines[1:])
-                
-                # Valider qu'on a au moins une cote
-                if cote_data['cote_boostee']:
-                    cotes.append(cote_data)
-                    print(f"✅ Cote extraite: {cote_data['cote_boostee']} - {cote_data['sport']}")
-            
-            except Exception as e:
-                print(f"⚠️ Erreur extraction élément: {e}")
-                continue
+        # Attendre que les cartes soient rendues et stables
+        self.waiter.wait(self.driver, 'load')
+        
+        # Accepter les cookies
+        if self.accept_cookies():
+            # Le contenu peut se re-rendre une fois la popup fermée
+            self.waiter.wait(self.driver, 'after_cookies')
+        
+        # Scroll pour charger le contenu
+        print("📜 Scroll de la page...")
+        self.scroll_page()
+        self.waiter.report()
+        
+        # Page identique au dernier run : rien à extraire ni exporter
+        if self.detector and self.detector.unchanged(key, card_texts(self.driver)):
+            self.unchanged_urls.append(url)
+            return OddsBatch()
+        
+        # Prendre un screenshot APRÈS avoir accepté les cookies (écrit en arrière-plan)
+        if config.SAVE_SCREENSHOTS:
+            timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
+            screenshot_path = config.SCREENSHOTS_DIR / f"selenium_{timestamp}_{url_slug(url)}.png"
+            image_writer.save(self.driver.get_screenshot_as_png(), screenshot_path)
+            print(f"📸 Screenshot: {screenshot_path}")
+        
+        # Extraire les données
+        print("🔍 Extraction des données...")
+        cotes = build_cotes(extract_cards(self.driver), 'selenium')
+        if not cotes:
+            # Repli : page_source parsé côté Python
+            print("ℹ️ Extraction JS vide, repli sur le parsing HTML")
+            cotes = self.extract_cotes_data()
+        
+        if not cotes:
+            print(f"⚠️ Aucune cote extraite sur {url} - vérifiez le screenshot")
+        elif self.detector:
+            self.detector.accept(key)
         
         return cotes
     
     def scrape(self):
-        """Scrape la page des cotes boostées"""
+        """Scrape les pages des cotes boostées (une à la fois, un seul driver)"""
         try:
             print("🚀 Démarrage du scraping avec Selenium...")
             self.setup_driver()
+            self.blocker.attach_selenium(self.driver)
+            self.unchanged_urls = []
             
-            print(f"📄 Chargement de {config.TARGET_URL}")
-            self.driver.get(config.TARGET_URL)
-            
-            # Attendre un peu que la page charge
-            time.sleep(config.DELAY)
-            
-            # Accepter les cookies
-            self.accept_cookies()
-            
-            # Attendre encore un peu après avoir accepté les cookies
-            time.sleep(config.DELAY)
-            
-            # Scroll pour charger le contenu
-            print("📜 Scroll de la page...")
-            self.scroll_page()
-            
-            # Prendre un screenshot APRÈS avoir accepté les cookies
-            timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
-            screenshot_path = config.SCREENSHOTS_DIR / f"selenium_{timestamp}.png"
-            self.driver.save_screenshot(str(screenshot_path))
-            print(f"📸 Screenshot: {screenshot_path}")
+            batches = []
+            for url in self.urls:
+                try:
+                    batches.append(self.scrape_page(url))
+                except Exception as e:
+                    print(f"❌ Erreur Selenium ({url}): {e}")
             
-            # Extraire les données
-            print("🔍 Extraction des données...")
-            cotes = self.extract_cotes_data()
+            self.blocker.collect_selenium(self.driver)
+            self.network_stats = self.blocker.report()
+            self.unchanged = len(self.unchanged_urls) == len(self.urls)
             
-            if not cotes:
-                print("⚠️ Aucune cote extraite - vérifiez le screenshot")
-            else:
+            # Un même boost peut figurer sur plusieurs pages
+            cotes = dedupe_odds(OddsBatch.concat(batches))
+            if cotes:
                 print(f"✨ {len(cotes)} cotes extraites avec succès!")
-            
             return cotes
             
         except Exception as e:
             print(f"❌ Erreur Selenium: {e}")
             import traceback
             traceback.print_exc()
-            return []
+            return OddsBatch()
         
         finally:
-            if self.driver:
+            if self.driver_pool is not None:
+                # Le driver reste ouvert pour le prochain scrape
+                self.driver = None
+            elif self.driver:
                 self.driver.quit()
                 print("🔒 Driver Selenium fermé")
@@ -0,0 +1,71 @@
+"""
+Conversion des exports JSON/CSV existants vers le dataset Parquet
+
+Chaque fichier cotes_<date>.json (ou .csv s'il n'a pas de JSON jumeau) est
+écrit sous output/parquet/date=AAAA-MM-JJ/ avec le nom du fichier source :
+relancer la conversion réécrit les mêmes fichiers au lieu de dupliquer.
+
+Usage:
+    python scripts/backfill_parquet.py [--output output/parquet]
+"""
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from utils.parquet_export import write_parquet
+
+
+def source_files():
+    """Exports à convertir, JSON prioritaire sur le CSV du même run"""
+    files = {path.stem: path for path in sorted(config.CSV_DIR.glob('cotes_*.csv'))}
+    files.update({path.stem: path for path in sorted(config.JSON_DIR.glob('cotes_*.json'))})
+    return [files[stem] for stem in sorted(files)]
+
+
+def read_records(path):
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('cotes', [])
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def file_date(path):
+    """Date tirée du nom cotes_<DATETIME_FORMAT> (si les timestamps manquent)"""
+    try:
+        stamp = datetime.strptime(path.stem[len('cotes_'):], config.DATETIME_FORMAT)
+        return stamp.strftime(config.DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill Parquet des exports existants')
+    parser.add_argument('--output', default=str(config.PARQUET_DIR), help='Racine du dataset Parquet')
+    args = parser.parse_args()
+
+    files = source_files()
+    print(f"📦 {len(files)} exports à convertir")
+    total = 0
+    for path in files:
+        try:
+            records = read_records(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {path.name} illisible: {e}")
+            continue
+        if not records:
+            continue
+        write_parquet(records, path.stem, Path(args.output), default_date=file_date(path))
+        total += len(records)
+
+    print(f"✅ {total} cotes écrites dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark du découpage des cartes : ancienne implémentation vs card_parser
+
+Usage:
+    python scripts/bench_card_parser.py page1.html page2.html ...
+    python scripts/bench_card_parser.py            # page synthétique
+
+Les pages sont des HTML sauvegardés de la page Winamax (ex. `page.content()`).
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup
+from scrapers.card_parser import extract_cotes, HAS_LXML
+
+
+def legacy_extract(html_content):
+    """Implémentation historique de PlaywrightScraper.extract_cotes_data"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    cotes = []
+    for element in soup.find_all(string=re.compile(r'(COTE.*BOOST|BOOST.*COTE)', re.I)):
+        card = element.find_parent('div', class_=lambda x: x and any(
+            keyword in str(x).lower() for keyword in ['card', 'boost', 'bet', 'event']
+        ))
+        if not card:
+            card = element.find_parent('div')
+            if not card:
+                continue
+        card_text = card.get_text(separator='\n', strip=True)
+        cote_data = {'heure': '', 'cote_boostee': ''}
+        time_match = re.search(r'\b([0-2]?[0-9]:[0-5][0-9])\b', card_text)
+        if time_match:
+            cote_data['heure'] = time_match.group(1)
+        odds = re.findall(r'\b(\d+[,\.]\d{2})\b', card_text)
+        if len(odds) >= 2:
+            cote_data['cote_boostee'] = odds[-1].replace('.', ',')
+        lines = [l.strip() for l in card_text.split('\n') if l.strip()]
+        relevant_lines = [
+            line for line in lines
+            if (len(line) > 5 and
+                'COTE' not in line.upper() and
+                'BOOST' not in line.upper() and
+                not re.match(r'^\d+[,\.]\d{2}$', line) and
+                not re.match(r'^\d{1,2}:\d{2}$', line))
+        ]
+        if cote_data['cote_boostee'] and (cote_data['heure'] or relevant_lines):
+            cotes.append(cote_data)
+    return cotes
+
+
+def synthetic_page(cards=60, filler=3000):
+    """Page proche de la structure Winamax : beaucoup de bruit, quelques cartes"""
+    noise = ''.join(
+        f'<div class="row"><span>Match {i}</span><span>{1 + i % 7},{i % 90 + 10}</span></div>'
+        for i in range(filler)
+    )
+    boosts = ''.join(
+        f'<div class="boost-card-{i}"><div><span>COTE BOOSTEE</span></div>'
+        f'<div>{18 + i % 5}:{i % 6}0</div><div>Football</div><div>Ligue 1</div>'
+        f'<div>Equipe {i} gagne et plus de 2,5 buts</div>'
+        f'<div><span>{2 + i % 3},10</span><span>{3 + i % 3},50</span></div></div>'
+        for i in range(cards)
+    )
+    return f'<html><body><div class="app">{noise}{boosts}{noise}</div></body></html>'
+
+
+def bench(label, func, html_content, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(html_content)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"  {label:<28} {elapsed:8.1f} ms  ({len(result)} cotes)")
+    return elapsed
+
+
+def main():
+    paths = sys.argv[1:]
+    pages = [(p, Path(p).read_text(encoding='utf-8')) for p in paths] or [('synthétique', synthetic_page())]
+    repeat = 5
+
+    for name, html_content in pages:
+        print(f"📄 {name} ({len(html_content) / 1024:.0f} Ko)")
+        reference = bench('ancien (html.parser)', legacy_extract, html_content, repeat)
+        if HAS_LXML:
+            fast = bench('card_parser (lxml)', lambda h: extract_cotes(h, 'bench', backend='lxml'), html_content, repeat)
+            print(f"  ⚡ x{reference / fast:.1f}")
+        bench('card_parser (soup)', lambda h: extract_cotes(h, 'bench', backend='soup'), html_content, repeat)
+
+
+if __name__ == "__main__":
+    main()
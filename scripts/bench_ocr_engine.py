@@ -0,0 +1,60 @@
+"""
+Benchmark des moteurs OCR : appels par seconde, pytesseract vs tesserocr
+
+Usage:
+    python scripts/bench_ocr_engine.py carte1.png carte2.png ...
+    python scripts/bench_ocr_engine.py            # image de carte synthétique
+
+Options via variables d'environnement : BENCH_CALLS (défaut 20),
+BENCH_MODELS (défaut "default", ex. "fast,best").
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2
+import numpy as np
+from scrapers.ocr_engine import get_engine, HAS_TESSEROCR
+
+
+def synthetic_card():
+    """Image ressemblant à une carte de cote boostée"""
+    img = np.full((180, 520), 255, dtype=np.uint8)
+    lines = ['COTE BOOSTEE', '20:45  Football', 'Ligue 1', 'PSG gagne le match', '2,10  ->  2,60']
+    for i, line in enumerate(lines):
+        cv2.putText(img, line, (10, 30 + i * 32), cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    return img
+
+
+def bench(engine_name, model, images, calls):
+    engine = get_engine(model=model, engine=engine_name)
+    engine.image_to_string(images[0])  # chargement du modèle hors mesure
+
+    start = time.perf_counter()
+    for i in range(calls):
+        engine.image_to_string(images[i % len(images)])
+    elapsed = time.perf_counter() - start
+
+    print(f"  {engine.name:<12} {model:<8} {calls / elapsed:7.1f} appels/s  ({elapsed / calls * 1000:.0f} ms/appel)")
+
+
+def main():
+    images = [cv2.imread(p, cv2.IMREAD_GRAYSCALE) for p in sys.argv[1:]] or [synthetic_card()]
+    calls = int(os.environ.get('BENCH_CALLS', 20))
+    models = os.environ.get('BENCH_MODELS', 'default').split(',')
+
+    engines = ['pytesseract'] + (['tesserocr'] if HAS_TESSEROCR else [])
+    if not HAS_TESSEROCR:
+        print("ℹ️ tesserocr non installé : seul pytesseract est mesuré")
+
+    print(f"👁️ {len(images)} image(s), {calls} appels par moteur")
+    for model in models:
+        for engine_name in engines:
+            bench(engine_name, model, images, calls)
+
+
+if __name__ == "__main__":
+    main()
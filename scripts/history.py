@@ -0,0 +1,59 @@
+"""
+Gestion de l'historique des cotes (output/json/history.jsonl)
+
+Usage:
+    python scripts/history.py stats
+    python scripts/history.py read --start 2024-01-01 --end 2024-01-31 > janvier.jsonl
+    python scripts/history.py compact
+    python scripts/history.py import output/json/history.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.history_store import HistoryStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Historique des cotes boostées')
+    parser.add_argument('--file', help='Fichier d\'historique (défaut: output/json/history.jsonl)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('stats', help='Nombre de cotes par date')
+
+    read = commands.add_parser('read', help='Écrit les cotes d\'une plage de dates (JSONL) sur stdout')
+    read.add_argument('--start', help='Date ou timestamp ISO de début')
+    read.add_argument('--end', help='Date ou timestamp ISO de fin (inclus)')
+
+    commands.add_parser('compact', help='Trie par timestamp et supprime les doublons')
+
+    import_cmd = commands.add_parser('import', help='Importe un ancien history.json')
+    import_cmd.add_argument('json_file')
+
+    args = parser.parse_args()
+    store = HistoryStore(args.file)
+
+    if args.command == 'stats':
+        counts = store.dates()
+        for date, count in sorted(counts.items()):
+            print(f"{date}  {count:6d}")
+        print(f"📊 {sum(counts.values())} cotes sur {len(counts)} jours, {len(store.index)} blocs d'index")
+
+    elif args.command == 'read':
+        for record in store.read(args.start, args.end):
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    elif args.command == 'compact':
+        before, after = store.compact()
+        print(f"🗜️ {before} -> {after} cotes, {len(store.index)} blocs d'index")
+
+    elif args.command == 'import':
+        count = store.import_json(args.json_file)
+        print(f"📚 {count} cotes importées dans {store.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,87 @@
 import re
 import os
+import sys
 import cv2
-import pandas as pd
-from PIL import Image, ImageOps, ImageEnhance
+import numpy as np
+from pathlib import Path
 from datetime import datetime
 from playwright.sync_api import sync_playwright
-import pytesseract
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scrapers.ocr_engine import get_engine
+from scrapers.preprocessing import Pipeline
+from utils.image_writer import image_writer
+from utils.sqlite_store import SQLiteStore, OCR_HISTORY_COLUMNS, OCR_HISTORY_KEY
+from utils.models import OddsBatch, format_odd, parse_odd
+from utils.fuzzy_index import FuzzyIndex, boost_key
 
 URL = "https://www.winamax.fr/paris-sportifs/sports/100000"
 CSV_PATH = "data/historique.csv"
+DB_PATH = "data/historique.db"
+INDEX_PATH = "data/historique.fuzzy.jsonl"
+PIPELINE = Pipeline(["invert", "contrast:2.5"])
 
-def preprocess(img_path):
-    img = Image.open(img_path).convert("L")
-    img = ImageOps.invert(img)
-    img = ImageEnhance.Contrast(img).enhance(2.5)
-    tmp = img_path.replace(".png", "_prep.png")
-    img.save(tmp)
-    return tmp
+def preprocess(png):
+    gray = cv2.imdecode(np.frombuffer(png, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    return PIPELINE(gray)
 
-def ocr_image(img_path):
-    return pytesseract.image_to_string(
-        Image.open(img_path),
-        config="--psm 6 -l fra"
-    )
+def ocr_image(img):
+    return get_engine("--psm 6 -l fra").image_to_string(img)
 
 def parse(text):
-    rows = []
+    # Un seul timestamp pour tout le run
+    batch = OddsBatch(timestamp=datetime.utcnow())
     blocks = text.split("COTE BOOST")
     for b in blocks:
         cote = re.findall(r"\b\d+,\d+\b", b)
         heure = re.findall(r"\b\d{2}:\d{2}\b", b)
         if cote:
-            rows.append({
-                "timestamp": datetime.utcnow().isoformat(),
-                "heure_event": heure[0] if heure else "",
-                "texte": re.sub(r"\s+", " ", b.strip()),
-                "cote_boostee": cote[-1].replace(",", "."),
-                "bookmaker": "winamax"
-            })
-    return rows
-
-def deduplicate(df):
-    return df.drop_duplicates(
-        subset=["heure_event", "texte", "cote_boostee", "bookmaker"],
-        keep="first"
-    )
+            batch.add({
+                "heure": heure[0] if heure else "",
+                "description": re.sub(r"\s+", " ", b.strip()),
+                "cote_boostee": cote[-1]
+            }, "ocr")
+    return batch
+
+def to_row(odd):
+    # Colonnes historiques de data/historique.csv
+    return {
+        "timestamp": odd.timestamp.isoformat(),
+        "heure_event": odd["heure"],
+        "texte": odd.description,
+        "cote_boostee": f"{odd.cote_boostee:.2f}",
+        "bookmaker": "winamax"
+    }
+
+def normalize_cote(value):
+    # pandas relisait les cotes en float : "2.60" devenait "2.6" dans le CSV
+    try:
+        return f"{float(value):.2f}"
+    except ValueError:
+        return value
+
+def open_store():
+    # Base SQLite de l'historique ; l'ancien CSV y est importé une seule fois
+    is_new = not os.path.exists(DB_PATH)
+    store = SQLiteStore(DB_PATH, table="historique", columns=OCR_HISTORY_COLUMNS, key=OCR_HISTORY_KEY)
+    if is_new and os.path.exists(CSV_PATH):
+        read, added = store.import_csv(CSV_PATH, converters={"cote_boostee": normalize_cote})
+        print(f"📚 {CSV_PATH}: {read} lignes lues, {added} importées")
+    return store
+
+def row_key(row):
+    # Même clé que boost_key() : "20:45|2,60"
+    return f"{row['heure_event']}|{format_odd(parse_odd(row['cote_boostee']))}"
+
+def open_index(store):
+    # Index des quasi-doublons ; construit depuis la base au premier lancement
+    is_new = not os.path.exists(INDEX_PATH)
+    index = FuzzyIndex(INDEX_PATH)
+    if is_new:
+        added = index.extend((row["texte"], row_key(row)) for row in store.rows())
+        print(f"🔎 Index des doublons: {added} cotes distinctes indexées")
+    return index
 
 def main():
     os.makedirs("data", exist_ok=True)
@@ -55,26 +92,23 @@ def main():
         page.goto(URL, timeout=60000)
         page.wait_for_selector("text=COTE BOOST", timeout=20000)
         page.wait_for_timeout(3000)
-        page.screenshot(path="screen.png", full_page=True)
+        png = page.screenshot(full_page=True)
         browser.close()
 
-    prep = preprocess("screen.png")
-    text = ocr_image(prep)
-    rows = parse(text)
+    image_writer.save(png, "screen.png")
+    text = ocr_image(preprocess(png))
+    odds = parse(text)
 
-    if not rows:
+    if not odds:
         return
 
-    df_new = pd.DataFrame(rows)
-
-    if os.path.exists(CSV_PATH):
-        df_old = pd.read_csv(CSV_PATH)
-        df = pd.concat([df_old, df_new], ignore_index=True)
-    else:
-        df = df_new
-
-    df = deduplicate(df)
-    df.to_csv(CSV_PATH, index=False)
+    # Quasi-doublons écartés (un caractère mal lu par l'OCR ne fait pas une nouvelle cote),
+    # puis INSERT OR IGNORE sur la clé de dédoublonnage : coût proportionnel aux nouvelles lignes
+    with open_store() as store:
+        index = open_index(store)
+        new = [odd for odd in odds if not index.seen(odd.description, boost_key(odd))]
+        added = store.insert(to_row(odd) for odd in new)
+    print(f"💾 {added} nouvelles cotes sur {len(odds)} lues ({len(odds) - len(new)} quasi-doublons)")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,159 @@
+"""
+Réglage du prétraitement OCR : latence vs précision sur un corpus étiqueté
+
+Le corpus est un dossier d'images PNG, chacune accompagnée d'un fichier JSON
+de même nom décrivant les cotes attendues :
+    - une carte seule : {"heure": "20:45", "cote_originale": "2,10", "cote_boostee": "2,60"}
+    - une page entière : [{...}, {...}]
+
+Chaque combinaison (pipeline de prétraitement × --psm × --oem) est exécutée
+sur tout le corpus ; le script affiche la latence moyenne par image et la
+précision par champ, et marque les configurations Pareto-optimales.
+
+Usage:
+    python scripts/tune_ocr.py corpus/ [--psm 6,11] [--oem 1,3] [--output resultats.json]
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cv2
+from scrapers.preprocessing import Pipeline
+from scrapers.ocr_engine import get_engine
+from scrapers.card_parser import parse_card
+from scrapers.ocr_scraper import OCRScraper
+
+
+FIELDS = ['heure', 'cote_originale', 'cote_boostee']
+
+UPSCALERS = [None, 'upscale:linear:2', 'upscale:cubic:2', 'upscale:lanczos:2']
+DENOISERS = [None, 'denoise:median', 'denoise:bilateral', 'denoise:nlm']
+THRESHOLDS = [None, 'threshold:otsu', 'threshold:adaptive']
+
+
+def candidate_pipelines():
+    """Toutes les combinaisons d'étapes (niveaux de gris seul compris)"""
+    for stages in itertools.product(UPSCALERS, DENOISERS, THRESHOLDS):
+        yield [s for s in stages if s]
+
+
+def load_corpus(directory):
+    corpus = []
+    for image_path in sorted(Path(directory).glob('*.png')):
+        label_path = image_path.with_suffix('.json')
+        if not label_path.exists():
+            continue
+        with open(label_path, 'r', encoding='utf-8') as f:
+            label = json.load(f)
+        corpus.append((image_path.name, cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE), label))
+    return corpus
+
+
+def normalize(value):
+    return str(value or '').strip().replace('.', ',')
+
+
+def field_accuracy(expected, found):
+    """Part des champs attendus retrouvés à l'identique"""
+    if isinstance(expected, dict):
+        expected = [expected]
+    total = len(expected) * len(FIELDS)
+    correct = 0
+    remaining = list(found)
+    for record in expected:
+        # Associer la cote trouvée qui partage le plus de champs
+        best, best_score = None, -1
+        for candidate in remaining:
+            score = sum(normalize(record.get(f)) == normalize(candidate.get(f)) for f in FIELDS)
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is not None:
+            remaining.remove(best)
+            correct += best_score
+    return correct / total if total else 0.0
+
+
+def parse_text(text, label, scraper):
+    if isinstance(label, dict):
+        return [parse_card([l.strip() for l in text.split('\n') if l.strip()])]
+    return scraper.parse_ocr_text(text)
+
+
+def evaluate(corpus, specs, psm, oem, scraper):
+    pipeline = Pipeline(specs)
+    engine = get_engine(tess_config=f'--oem {oem} --psm {psm} -l fra')
+    latencies = []
+    accuracies = []
+    for _, image, label in corpus:
+        start = time.perf_counter()
+        text = engine.image_to_string(pipeline(image))
+        latencies.append(time.perf_counter() - start)
+        accuracies.append(field_accuracy(label, parse_text(text, label, scraper)))
+    return {
+        'pipeline': specs,
+        'psm': psm,
+        'oem': oem,
+        'latency_ms': sum(latencies) / len(latencies) * 1000,
+        'accuracy': sum(accuracies) / len(accuracies)
+    }
+
+
+def mark_pareto(results):
+    """Pareto-optimal : aucune autre config n'est à la fois plus rapide et plus précise"""
+    for r in results:
+        r['pareto'] = not any(
+            o['latency_ms'] <= r['latency_ms'] and o['accuracy'] >= r['accuracy']
+            and (o['latency_ms'] < r['latency_ms'] or o['accuracy'] > r['accuracy'])
+            for o in results
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Réglage du prétraitement OCR')
+    parser.add_argument('corpus', help='Dossier d\'images PNG étiquetées (JSON)')
+    parser.add_argument('--psm', default='6,11', help='Modes de segmentation à tester')
+    parser.add_argument('--oem', default='1,3', help='Moteurs Tesseract à tester')
+    parser.add_argument('--output', help='Fichier JSON où écrire tous les résultats')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ Aucune image étiquetée dans {args.corpus}")
+        sys.exit(1)
+
+    psms = [int(p) for p in args.psm.split(',')]
+    oems = [int(o) for o in args.oem.split(',')]
+    combos = list(itertools.product(candidate_pipelines(), psms, oems))
+    print(f"🔬 {len(corpus)} images, {len(combos)} configurations")
+
+    scraper = OCRScraper()
+    results = []
+    for specs, psm, oem in combos:
+        try:
+            results.append(evaluate(corpus, specs, psm, oem, scraper))
+        except Exception as e:
+            print(f"⚠️ {specs} psm={psm} oem={oem}: {e}")
+
+    mark_pareto(results)
+    results.sort(key=lambda r: r['latency_ms'])
+
+    print(f"\n{'latence':>9}  {'précision':>9}  configuration")
+    for r in results:
+        marker = '⭐' if r['pareto'] else '  '
+        pipeline = ' > '.join(r['pipeline']) or 'grayscale'
+        print(f"{r['latency_ms']:7.0f}ms  {r['accuracy']:8.0%}  {marker} {pipeline} --psm {r['psm']} --oem {r['oem']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Résultats: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
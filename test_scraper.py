@@ -141,6 +141,372 @@ def test_data_export():
         print(f"❌ Erreur export: {e}")
         return False
 
+def test_card_parser():
+    """Test du découpage des cartes de cotes dans le HTML"""
+    print("\n🧪 Test du parsing des cartes...")
+    try:
+        from scrapers.card_parser import extract_cotes
+        
+        html = (
+            '<html><body><div class="row">Autre match 1,50</div>'
+            '<div class="boost-card"><span>COTE BOOSTEE</span><div>20:45</div>'
+            '<div>Football</div><div>Ligue 1</div><div>PSG gagne le match</div>'
+            '<div><span>2,10</span><span>2,60</span></div></div></body></html>'
+        )
+        
+        for backend in ['lxml', 'soup']:
+            cotes = extract_cotes(html, 'test', backend=backend)
+            assert len(cotes) == 1, f"{len(cotes)} cartes trouvées ({backend})"
+            assert cotes[0]['heure'] == '20:45', f"Heure incorrecte ({backend})"
+            assert cotes[0]['cote_originale'] == '2,10', f"Cote originale incorrecte ({backend})"
+            assert cotes[0]['cote_boostee'] == '2,60', f"Cote boostée incorrecte ({backend})"
+            assert cotes[0]['description'] == 'PSG gagne le match', f"Description incorrecte ({backend})"
+        
+        print("✅ Cartes extraites (lxml et BeautifulSoup)")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur parsing: {e}")
+        return False
+
+def test_stitch():
+    """Test du recollage des bandes OCR"""
+    print("\n🧪 Test du recollage des bandes OCR...")
+    try:
+        from scrapers.ocr_tiling import stitch
+        
+        # Bandes [0, 120) et [100, 220) : chevauchement de 100 à 120 px
+        first = (0, 120, [
+            ('COTE BOOSTEE', 10, 25), ('2,10 2,60', 80, 95),
+            ('Ligue 1', 101, 110), ('PSG gag', 112, 120)
+        ])
+        second = (100, 220, [
+            ('Ligue 1', 101, 110), ('PSG gagne', 112, 128), ('2,10 2,60', 135, 150)
+        ])
+        lines = stitch([first, second]).split('\n')
+        
+        assert lines.count('Ligue 1') == 1, "Ligne du chevauchement lue deux fois"
+        assert lines.count('2,10 2,60') == 2, "Cotes identiques de deux cartes voisines perdues"
+        assert 'PSG gagne' in lines and 'PSG gag' not in lines, "Ligne coupée non remplacée"
+        assert lines == ['COTE BOOSTEE', '2,10 2,60', 'Ligue 1', 'PSG gagne', '2,10 2,60'], "Ordre incorrect"
+        
+        print("✅ Recollage des bandes OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur recollage: {e}")
+        return False
+
+def test_digit_pass():
+    """Test de la normalisation des valeurs relues par la passe chiffres"""
+    print("\n🧪 Test de la passe chiffres...")
+    try:
+        from scrapers.ocr_digits import normalize_number
+        
+        assert normalize_number('2.60', '2,6O') == '2,60', "Cote relue incorrecte"
+        assert normalize_number('260', '2,6O') == '2,60', "Virgule perdue non restaurée"
+        assert normalize_number('20:45', '2O:45') == '20:45', "Heure relue incorrecte"
+        # Nombre de 3 chiffres sans séparateur : ni une cote, ni une correction
+        for number in ('180', '100', '250'):
+            assert normalize_number(number, number) is None, f"{number} transformé en cote"
+        
+        print("✅ Passe chiffres OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur passe chiffres: {e}")
+        return False
+
+def test_ocr_cache():
+    """Test du cache OCR : une cote modifiée ne doit pas être reprise du cache"""
+    print("\n🧪 Test du cache OCR...")
+    try:
+        import tempfile
+        import cv2
+        import numpy as np
+        from scrapers.ocr_cache import OCRCache, image_key
+        
+        def card(odds):
+            img = np.full((150, 400), 255, dtype=np.uint8)
+            cv2.putText(img, 'PSG gagne', (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, 0, 2)
+            cv2.putText(img, odds, (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, 0, 2)
+            return img
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = OCRCache('test', Path(tmp) / 'cache.json')
+            cache.put(image_key(card('2,60')), 'PSG gagne 2,60', {'cote_boostee': '2,60'})
+            
+            assert cache.get(image_key(card('2,60'))), "Carte identique non reprise du cache"
+            for odds in ('2,80', '2,61', '12,60'):
+                assert cache.get(image_key(card(odds))) is None, f"Cote {odds} reprise du cache (2,60)"
+            assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 3, "Compteurs incorrects"
+        
+        print("✅ Cache OCR OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur cache OCR: {e}")
+        return False
+
+def test_network_extraction():
+    """Test de l'extraction des cotes depuis des payloads réseau"""
+    print("\n🧪 Test de l'extraction réseau...")
+    try:
+        import asyncio
+        from scrapers.network_scraper import NetworkScraper
+        
+        payloads = [
+            # XHR : liste de boosts, début du match en epoch UTC (18:30 UTC = 20:30 à Paris)
+            {'source': 'xhr', 'url': 'u', 'data': {'boosts': [{
+                'title': 'PSG gagne et Mbappé buteur', 'boostedOdds': 2.6, 'previousOdds': '2,10',
+                'matchStart': 1760812200, 'sportName': 'Football', 'tournamentName': 'Ligue 1'
+            }]}},
+            # État normalisé : cote indexée par issue, champs portés par le match parent
+            {'source': 'preloaded_state', 'url': 'u', 'data': {
+                'matches': {'1': {'matchStart': '2025-10-18T16:00:00Z', 'sportName': 'Tennis',
+                                  'bets': [{'betTitle': 'Cote boostée : Alcaraz gagne', 'outcomeId': 42}]}},
+                'odds': {'42': 1.9}
+            }},
+            # WebSocket : même boost que le XHR (epoch en ms, cotes en texte)
+            {'source': 'websocket', 'url': 'u', 'data': {'boosts': [{
+                'title': 'PSG gagne et Mbappé buteur', 'boostedOdds': '2,60', 'previousOdds': 2.1,
+                'matchStart': 1760812200000, 'sportName': 'Football'
+            }]}}
+        ]
+        
+        cotes = NetworkScraper().extract_cotes_data(payloads)
+        assert len(cotes) == 2, f"2 cotes attendues, {len(cotes)} extraites"
+        
+        psg, tennis = cotes
+        assert psg['heure'] == '20:30', f"Heure de Paris attendue, obtenu {psg['heure']}"
+        assert psg.cote_originale == 2.1 and psg.cote_boostee == 2.6, "Cotes incorrectes"
+        assert psg.competition == 'Ligue 1' and psg.sport == 'Football', "Contexte incorrect"
+        assert tennis['heure'] == '18:00' and tennis.cote_boostee == 1.9, "État normalisé mal lu"
+        assert tennis.sport == 'Tennis' and tennis.method == 'network', "Champs du parent non repris"
+        
+        # Réponse arrivée après le gather de sa page : lue avant l'extraction, pas au run suivant
+        class LateResponse:
+            url = 'late'
+            headers = {'content-type': 'application/json'}
+            async def text(self):
+                await asyncio.sleep(0.05)
+                return '{"boosts": []}'
+        
+        async def late_run():
+            scraper._on_response(LateResponse())
+            await scraper._drain_pending()
+        
+        scraper = NetworkScraper()
+        asyncio.run(late_run())
+        assert len(scraper.payloads) == 1 and not scraper._pending, "Réponse tardive non attendue"
+        
+        print("✅ Extraction réseau OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur extraction réseau: {e}")
+        return False
+
+def test_history_store():
+    """Test de l'historique en ajout seul"""
+    print("\n🧪 Test de l'historique...")
+    try:
+        import tempfile
+        from utils.history_store import HistoryStore
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'history.jsonl'
+            store = HistoryStore(path)
+            store.append([
+                {'timestamp': '2024-01-01T20:00:00', 'heure': '20:45', 'cote_boostee': '2,60'},
+                {'timestamp': '2024-01-02T20:00:00', 'heure': '21:00', 'cote_boostee': '3,00'}
+            ])
+            store.append([{'timestamp': '2024-01-02T20:00:00', 'heure': '21:00', 'cote_boostee': '3,00'}])
+            
+            assert len(list(store.read('2024-01-02', '2024-01-02'))) == 2, "Lecture par date incorrecte"
+            assert len(store.index) == 2, "Un bloc d'index par date attendu, pas un par ajout"
+            
+            # Écriture interrompue : la ligne incomplète est supprimée à la reprise
+            with open(path, 'ab') as f:
+                f.write(b'{"timestamp": "2024-01-03')
+            store = HistoryStore(path)
+            assert len(list(store.read())) == 3, "Reprise après écriture partielle incorrecte"
+            
+            assert store.compact() == (3, 2), "Compaction incorrecte"
+            assert store.dates() == {'2024-01-01': 1, '2024-01-02': 1}, "Index incorrect"
+        
+        print("✅ Historique: ajout, lecture par date, reprise et compaction OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur historique: {e}")
+        return False
+
+def test_models():
+    """Test du modèle de cote typé"""
+    print("\n🧪 Test du modèle BoostedOdd...")
+    try:
+        from utils.models import BoostedOdd, OddsBatch
+        
+        batch = OddsBatch.from_dicts([
+            {'heure': '20:45', 'sport': 'Football', 'cote_originale': '2,10', 'cote_boostee': '2,60'},
+            {'heure': '', 'sport': 'Tennis', 'cote_boostee': '1.8'}
+        ], method='test')
+        
+        assert len(batch) == 2, "Taille du lot incorrecte"
+        first, second = batch
+        assert first.cote_boostee == 2.6 and first.heure.hour == 20, "Valeurs typées incorrectes"
+        assert second.cote_originale is None and second.heure is None, "Valeurs absentes incorrectes"
+        assert first.timestamp == second.timestamp, "Un seul timestamp par run attendu"
+        
+        record = second.to_dict()
+        assert record['cote_boostee'] == '1,80' and record['heure'] == '', "Format d'export incorrect"
+        assert BoostedOdd.from_dict(first.to_dict()) == first, "Aller-retour dict incorrect"
+        
+        print("✅ Modèle typé et lot en colonnes OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur modèle: {e}")
+        return False
+
+def test_scheduler():
+    """Test de la planification adaptative du mode veille"""
+    print("\n🧪 Test de la planification adaptative...")
+    try:
+        import tempfile
+        from datetime import datetime, timedelta
+        import config
+        from scrapers.scheduler import AdaptiveScheduler
+        from utils.models import OddsBatch
+        
+        settings = dict(config.SCHEDULER, min_interval_s=60, max_interval_s=1800, runs_per_hour=30,
+                        kickoff_window_min=90, polls_before_kickoff=6, initial_change_rate=0.0)
+        
+        def batch(heure, cote='2,60'):
+            return OddsBatch.from_dicts([{'heure': heure, 'description': 'PSG gagne', 'cote_boostee': cote}], 'test')
+        
+        def delay(scheduler, now):
+            return (scheduler.plan(now) - now).total_seconds()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / 'scheduler.jsonl'
+            now = datetime(2024, 1, 1, 3, 0)
+            
+            # Page figée, aucun match : intervalle maximal
+            idle = AdaptiveScheduler(settings, log_path)
+            idle.observe(OddsBatch(), now)
+            assert delay(idle, now) == 1800, "Borne max non appliquée"
+            
+            # Coup d'envoi dans 60 min : 6 passages d'ici là
+            soon = AdaptiveScheduler(settings, log_path)
+            soon.observe(batch('04:00'), now)
+            assert delay(soon, now) == 600, "Pas d'accélération avant le coup d'envoi"
+            
+            # Coup d'envoi dans 2 min : ramené à la borne min
+            assert delay(soon, datetime(2024, 1, 1, 3, 58)) == 60, "Borne min non appliquée"
+            
+            # Match de 00:30 vu à 23:30 : c'est celui du lendemain
+            late = AdaptiveScheduler(settings, log_path)
+            late.observe(batch('00:30'), datetime(2024, 1, 1, 23, 30))
+            assert late.next_kickoff(datetime(2024, 1, 1, 23, 30)) == datetime(2024, 1, 2, 0, 30), "Lendemain non reconnu"
+            assert delay(late, datetime(2024, 1, 1, 23, 30)) == 600, "Accélération du lendemain absente"
+            
+            # Budget de 3 runs par heure atteint : report après le plus ancien + 1 h
+            busy = AdaptiveScheduler(dict(settings, runs_per_hour=3), log_path)
+            for minutes, cote in [(30, '2,10'), (20, '2,20'), (10, '2,30')]:
+                busy.observe(batch('03:45', cote), now - timedelta(minutes=minutes))
+            assert busy.change_rate > 0, "Changements non comptés"
+            assert busy.plan(now) == now + timedelta(minutes=30), "Budget horaire non respecté"
+            
+            assert len(log_path.read_text(encoding='utf-8').splitlines()) == 5, "Décisions non journalisées"
+        
+        print("✅ Bornes, coups d'envoi, lendemain et budget OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur planification: {e}")
+        return False
+
+def test_fusion():
+    """Test de la fusion des résultats de plusieurs méthodes"""
+    print("\n🧪 Test de la fusion multi-méthodes...")
+    try:
+        from utils.fusion import OddsFusion
+        from utils.models import OddsBatch
+        from utils.schema import FUSED_SCHEMA, project
+        
+        batch = OddsBatch()
+        batch.add({'heure': '20:45', 'sport': 'Football', 'description': 'PSG gagne et Mbappé buteur',
+                   'cote_originale': '2,10', 'cote_boostee': '2,60'}, 'playwright')
+        batch.add({'heure': '20:45', 'sport': 'Football', 'description': 'PSG gagne et Mbappe buteur ',
+                   'cote_originale': '2,10', 'cote_boostee': '2,60'}, 'selenium')
+        batch.add({'heure': '20:45', 'sport': 'Footbal', 'description': 'PSG gagne ct Mbappé buteur',
+                   'cote_originale': '2,10', 'cote_boostee': '2,80'}, 'ocr')
+        batch.add({'heure': '18:00', 'sport': 'Tennis', 'description': 'Alcaraz gagne en 3 sets',
+                   'cote_boostee': '1,90'}, 'playwright')
+        
+        fusion = OddsFusion()
+        fused = fusion.fuse(batch)
+        assert len(fused) == 2, "Les trois lectures du même boost doivent être fusionnées"
+        
+        psg, tennis = fused
+        assert psg.methods == ['ocr', 'playwright', 'selenium'], "Méthodes sources incorrectes"
+        assert psg.odd.cote_boostee == 2.6, "La cote majoritaire doit l'emporter"
+        assert psg.odd.description == 'PSG gagne et Mbappé buteur', "Texte de la méthode la plus fiable attendu"
+        assert 0.5 < psg.confidence['cote_boostee'] < 1 and psg.confidence['heure'] == 1, "Confiance par champ incorrecte"
+        assert tennis.score < psg.score, "Un boost vu par une seule méthode est moins sûr"
+        assert fusion.needs_escalation(fused), "Confiance faible : l'OCR devrait être lancé"
+        
+        row = project(psg, FUSED_SCHEMA)
+        assert row['confidence'] == round(psg.score, 2), "Confiance globale absente de l'export"
+        assert row['confidence_heure'] == 1 and 0.5 < row['confidence_cote_boostee'] < 1, "Confiance par champ absente de l'export"
+        
+        print("✅ Fusion et confiance OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur fusion: {e}")
+        return False
+
+def test_fuzzy_index():
+    """Test de l'index de quasi-doublons"""
+    print("\n🧪 Test de l'index de quasi-doublons...")
+    try:
+        import tempfile
+        from pathlib import Path
+        from utils.fuzzy_index import FuzzyIndex, dedupe_odds
+        from utils.models import OddsBatch
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'index.jsonl'
+            index = FuzzyIndex(path)
+            key = '20:45|2,60'
+            
+            assert not index.seen('PSG gagne et Mbappé buteur', key), "Premier boost vu comme doublon"
+            assert index.seen('PSG gagne ct Mbappé buteur', key), "Erreur d'un caractère non reconnue"
+            assert not index.seen('PSG gagne et Dembélé buteur', key), "Boost distinct confondu (même heure, même cote)"
+            assert not index.seen('PSG gagne et Mbappé buteur', '20:45|3,00'), "Cote différente confondue"
+            
+            reloaded = FuzzyIndex(path)
+            assert len(reloaded) == 3, "Index persistant incorrect"
+            assert reloaded.query('PSG gagne et Mbappe buteur', key), "Index relu sans ses entrées"
+            assert not FuzzyIndex(path, threshold=0.99).query('PSG gagne ct Mbappé buteur', key), "Seuil ignoré"
+        
+        # Nombres, plus/moins et noms différents : boosts distincts malgré des textes proches
+        index = FuzzyIndex()
+        key = '21:00|3,50'
+        for first, second in [
+            ('Arsenal ou match nul et moins de 3,5 buts', 'Arsenal ou match nul et plus de 3,5 buts'),
+            ('PSG gagne le match', 'OM gagne le match'),
+            ('Nadal gagne en 3 sets', 'Nadal gagne en 4 sets'),
+        ]:
+            assert not index.seen(first, key), f"Premier boost vu comme doublon: {first}"
+            assert not index.seen(second, key), f"Boost distinct confondu: {second}"
+        assert index.seen('Arsenal ou match nul et moins de 3,5 bufs', key), "Erreur d'un caractère non reconnue"
+        
+        # Même dédoublonnage entre pages pour toutes les méthodes
+        pages = [OddsBatch.from_dicts([{'heure': '20:45', 'description': text, 'cote_boostee': '2,60'}], 'ocr')
+                 for text in ('PSG gagne et Mbappé buteur', 'PSG gagne ct Mbappé buteur', 'OM gagne et Mbappé buteur')]
+        assert len(dedupe_odds(OddsBatch.concat(pages))) == 2, "Quasi-doublon entre pages non fusionné"
+        
+        print("✅ Index de quasi-doublons OK")
+        return True
+    except Exception as e:
+        print(f"❌ Erreur index de quasi-doublons: {e}")
+        return False
+
 def run_all_tests():
     """Exécute tous les tests"""
     print("=" * 60)
@@ -153,7 +519,17 @@ def run_all_tests():
         ("Dépendances", test_dependencies),
         ("Tesseract OCR", test_tesseract),
         ("Playwright", test_playwright_browser),
-        ("Export de données", test_data_export)
+        ("Export de données", test_data_export),
+        ("Parsing des cartes", test_card_parser),
+        ("Recollage des bandes OCR", test_stitch),
+        ("Passe chiffres", test_digit_pass),
+        ("Cache OCR", test_ocr_cache),
+        ("Extraction réseau", test_network_extraction),
+        ("Historique", test_history_store),
+        ("Modèle de cote", test_models),
+        ("Planification adaptative", test_scheduler),
+        ("Fusion multi-méthodes", test_fusion),
+        ("Quasi-doublons", test_fuzzy_index)
     ]
     
     results = []
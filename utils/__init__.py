@@ -2,5 +2,12 @@
 Package d'utilitaires
 """
 from .data_exporter import DataExporter
+from .image_writer import AsyncImageWriter, image_writer
+from .history_store import HistoryStore
+from .sqlite_store import SQLiteStore
+from .models import BoostedOdd, OddsBatch
 
-__all__ = ['DataExporter']
+__all__ = [
+    'DataExporter', 'AsyncImageWriter', 'image_writer', 'HistoryStore', 'SQLiteStore',
+    'BoostedOdd', 'OddsBatch'
+]
@@ -1,75 +1,94 @@
 """
 Utilitaires pour exporter les données scrapées
 """
-import json
-import csv
 from datetime import datetime
 from pathlib import Path
 import config
+from .history_store import HistoryStore
+from .schema import COTES_SCHEMA
+from .streaming_export import StreamingExporter, JSONSink, JSONLinesSink, CSVSink
+from .sqlite_store import SQLiteStore
+from .parquet_export import write_parquet
+
+
+# Format d'export -> (dossier, extension, sink)
+STREAM_FORMATS = {
+    'json': (config.JSON_DIR, 'json', JSONSink),
+    'jsonl': (config.JSON_DIR, 'jsonl', JSONLinesSink),
+    'csv': (config.CSV_DIR, 'csv', CSVSink)
+}
 
 
 class DataExporter:
+    def __init__(self, schema=None):
+        self.schema = schema or COTES_SCHEMA
+    
+    def open_stream(self, formats, basename=None, schema=None):
+        """Exporteur en flux vers plusieurs formats (json, jsonl, csv)"""
+        if basename is None:
+            basename = f"cotes_{datetime.now().strftime(config.DATETIME_FORMAT)}"
+        sinks = []
+        for fmt in formats:
+            directory, extension, sink_class = STREAM_FORMATS[fmt]
+            sinks.append(sink_class(directory / f"{basename}.{extension}", schema or self.schema))
+        return StreamingExporter(sinks)
+    
     def export_json(self, data, filename=None):
-        """Exporte les données en JSON"""
+        """Exporte les données en JSON (itérable consommé en une passe)"""
         if filename is None:
             timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
             filename = f"cotes_{timestamp}.json"
         
-        filepath = config.JSON_DIR / filename
-        
-        export_data = {
-            'timestamp': datetime.now().isoformat(),
-            'count': len(data),
-            'cotes': data
-        }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, ensure_ascii=False, indent=2)
+        sink = JSONSink(config.JSON_DIR / filename, self.schema)
+        StreamingExporter([sink]).write_all(data)
+        sink.touch()
+        return sink.close()
+    
+    def export_jsonl(self, data, filename=None):
+        """Exporte les données en JSON Lines (une cote par ligne)"""
+        if filename is None:
+            timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
+            filename = f"cotes_{timestamp}.jsonl"
         
-        return filepath
+        sink = JSONLinesSink(config.JSON_DIR / filename, self.schema)
+        StreamingExporter([sink]).write_all(data)
+        sink.touch()
+        return sink.close()
     
     def export_csv(self, data, filename=None):
-        """Exporte les données en CSV"""
+        """Exporte les données en CSV (colonnes du schéma, en une passe)"""
         if filename is None:
             timestamp = datetime.now().strftime(config.DATETIME_FORMAT)
             filename = f"cotes_{timestamp}.csv"
         
-        filepath = config.CSV_DIR / filename
-        
-        if not data:
-            return filepath
-        
-        # Déterminer toutes les clés possibles
-        fieldnames = set()
-        for item in data:
-            fieldnames.update(item.keys())
-        fieldnames = sorted(list(fieldnames))
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
-        
-        return filepath
+        sink = CSVSink(config.CSV_DIR / filename, self.schema)
+        StreamingExporter([sink]).write_all(data)
+        sink.close()
+        return sink.path
     
-    def append_to_history(self, data, history_file='history.json'):
-        """Ajoute les données à un fichier historique"""
+    def export_parquet(self, data, basename=None):
+        """Exporte les données dans le dataset Parquet partitionné par date"""
+        if basename is None:
+            basename = f"cotes_{datetime.now().strftime(config.DATETIME_FORMAT)}"
+        return write_parquet(data, basename)
+    
+    def export_sqlite(self, data, db_path=None):
+        """Ajoute les cotes à la base SQLite (doublons ignorés)"""
+        with SQLiteStore(db_path) as store:
+            added = store.insert(data)
+            return store.path, added
+    
+    def append_to_history(self, data, history_file='history.jsonl'):
+        """Ajoute les données à l'historique (ajout seul, voir HistoryStore)"""
         filepath = config.JSON_DIR / history_file
         
-        # Charger l'historique existant
-        history = []
-        if filepath.exists():
-            with open(filepath, 'r', encoding='utf-8') as f:
-                try:
-                    history = json.load(f)
-                except json.JSONDecodeError:
-                    history = []
-        
-        # Ajouter les nouvelles données
-        history.extend(data)
-        
-        # Sauvegarder
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
+        # Reprendre une seule fois l'ancien history.json s'il existe
+        legacy = filepath.with_suffix('.json')
+        if legacy != filepath and legacy.exists() and not filepath.exists():
+            try:
+                HistoryStore(filepath).import_json(legacy)
+                print(f"📚 Ancien historique importé: {legacy}")
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ancien historique illisible, ignoré: {e}")
         
-        return filepath
+        return HistoryStore(filepath).append(data)
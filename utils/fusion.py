@@ -0,0 +1,166 @@
+"""
+Fusion des résultats de plusieurs méthodes (--method all / auto)
+
+Une même cote boostée est vue par Playwright, Selenium, l'OCR ou le réseau
+avec des textes un peu différents et parfois des cotes divergentes (erreur
+d'OCR). Les cotes sont regroupées par heure du match, cote et similarité de
+texte (une seule cote par méthode dans un groupe), puis chaque groupe donne
+une cote fusionnée : chaque champ est voté, pondéré par la fiabilité de la
+méthode, avec une confiance = poids des méthodes d'accord / poids de toutes
+les méthodes qui ont rendu des cotes.
+"""
+import re
+import unicodedata
+from difflib import SequenceMatcher
+import config
+from .models import BoostedOdd
+
+
+ODDS_FIELDS = ['cote_originale', 'cote_boostee']
+TEXT_FIELDS = ['sport', 'competition', 'description']
+KEY_FIELDS = ['heure', 'cote_boostee', 'description']
+
+
+def normalize_text(text):
+    """Minuscules, sans accents ni ponctuation, espaces réduits"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w]+', ' ', text.lower())).strip()
+
+
+def similarity(a, b):
+    """Similarité de deux textes entre 0 et 1 (après normalisation)"""
+    a, b = normalize_text(a), normalize_text(b)
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def record_text(odd):
+    return ' '.join(part for part in (odd.sport, odd.competition, odd.description) if part)
+
+
+class FusedOdd:
+    """Cote fusionnée : valeur retenue, confiance par champ, méthodes sources"""
+
+    __slots__ = ['odd', 'confidence', 'methods']
+
+    def __init__(self, odd, confidence, methods):
+        self.odd = odd
+        self.confidence = confidence
+        self.methods = methods
+
+    @property
+    def score(self):
+        """Confiance globale : celle du champ clé le moins sûr"""
+        return min(self.confidence[field] for field in KEY_FIELDS)
+
+    def to_dict(self):
+        """Dict à plat (voir FUSED_SCHEMA) : confiance globale et par champ"""
+        record = self.odd.to_dict()
+        record['methods'] = list(self.methods)
+        record['confidence'] = round(self.score, 2)
+        for field, value in self.confidence.items():
+            record[f'confidence_{field}'] = round(value, 2)
+        return record
+
+    def __repr__(self):
+        return f"FusedOdd({self.odd!r}, {'+'.join(self.methods)}, confiance {self.score:.2f})"
+
+
+class OddsFusion:
+    """Regroupe les cotes de plusieurs méthodes et fusionne chaque groupe"""
+
+    def __init__(self, settings=None):
+        self.settings = settings or config.FUSION
+
+    def weight(self, method):
+        return self.settings['method_weights'].get(method, self.settings['default_weight'])
+
+    def match_score(self, cluster, odd):
+        """Score de rapprochement d'une cote avec un groupe (0 si incompatible)"""
+        if any(member.method == odd.method for member in cluster):
+            return 0.0
+        score = max(similarity(record_text(member), record_text(odd)) for member in cluster)
+        for member in cluster:
+            if member.heure is not None and odd.heure is not None and member.heure != odd.heure:
+                return 0.0
+        if odd.heure is not None and any(member.heure == odd.heure for member in cluster):
+            score += self.settings['same_time_bonus']
+        if odd.cote_boostee is not None and any(
+            member.cote_boostee is not None
+            and abs(member.cote_boostee - odd.cote_boostee) <= self.settings['odds_tolerance']
+            for member in cluster
+        ):
+            score += self.settings['same_odds_bonus']
+        return score
+
+    def cluster(self, odds):
+        """Groupes de cotes décrivant le même boost"""
+        clusters = []
+        # Méthodes les plus fiables d'abord : elles servent de référence
+        for odd in sorted(odds, key=lambda o: -self.weight(o.method)):
+            best, best_score = None, self.settings['match_threshold']
+            for cluster in clusters:
+                score = self.match_score(cluster, odd)
+                if score >= best_score:
+                    best, best_score = cluster, score
+            if best is None:
+                clusters.append([odd])
+            else:
+                best.append(odd)
+        return clusters
+
+    def vote(self, cluster, field, total):
+        """Valeur retenue pour un champ et sa confiance"""
+        groups = []
+        for odd in cluster:
+            value = getattr(odd, field)
+            if value is None or value == '':
+                continue
+            weight = self.weight(odd.method)
+            for group in groups:
+                if self.same_value(field, group['value'], value):
+                    group['weight'] += weight
+                    # Le texte de la méthode la plus fiable représente le groupe
+                    if weight > group['best']:
+                        group['value'], group['best'] = value, weight
+                    break
+            else:
+                groups.append({'value': value, 'weight': weight, 'best': weight})
+        if not groups:
+            return None, 0.0
+        winner = max(groups, key=lambda g: g['weight'])
+        return winner['value'], winner['weight'] / total
+
+    def same_value(self, field, a, b):
+        if field in ODDS_FIELDS:
+            return abs(a - b) <= self.settings['odds_tolerance']
+        if field in TEXT_FIELDS:
+            return similarity(a, b) >= self.settings['text_similarity']
+        return a == b
+
+    def fuse(self, odds):
+        """Une FusedOdd par boost, des plus sûres aux moins sûres"""
+        odds = [odd if isinstance(odd, BoostedOdd) else BoostedOdd.from_dict(odd) for odd in odds]
+        total = sum(self.weight(method) for method in {odd.method for odd in odds})
+
+        fused = []
+        for cluster in self.cluster(odds):
+            values, confidence = {}, {}
+            for field in ['heure'] + TEXT_FIELDS + ODDS_FIELDS:
+                values[field], confidence[field] = self.vote(cluster, field, total)
+            methods = sorted(odd.method for odd in cluster)
+            odd = BoostedOdd(
+                timestamp=cluster[0].timestamp,
+                method='+'.join(methods),
+                **values
+            )
+            fused.append(FusedOdd(odd, confidence, methods))
+
+        fused.sort(key=lambda f: -f.score)
+        return fused
+
+    def needs_escalation(self, fused):
+        """True si aucune cote ou au moins une cote sous le seuil de confiance"""
+        return not fused or any(f.score < self.settings['min_confidence'] for f in fused)
@@ -0,0 +1,242 @@
+"""
+Index de quasi-doublons (MinHash + LSH) pour les cotes boostées
+
+Un texte (description normalisée) est découpé en shingles de caractères puis
+résumé par une signature MinHash : la proportion de valeurs égales entre deux
+signatures estime la similarité de Jaccard des textes. Les signatures sont
+rangées par bandes (LSH) dans des tables de hachage ; une requête ne compare
+que les quelques entrées qui partagent au moins une bande, d'où un temps
+constant quelle que soit la taille de l'historique.
+
+Une clé exacte (heure + cote boostée, nombres et mots plus/moins du texte)
+entre dans le hachage des bandes : deux boosts ne sont des doublons que s'ils
+ont la même clé ET des textes proches. Les mots propres à un seul des deux
+textes doivent en outre être des lectures proches l'un de l'autre (« et » /
+« ct ») : « PSG gagne » et « OM gagne » restent deux boosts. Un caractère mal
+lu par l'OCR ne crée donc plus de doublon, et deux boosts distincts à la même
+heure et à la même cote ne sont plus confondus.
+
+L'index est persistant (JSONL en ajout seul + signatures binaires) ou
+uniquement en mémoire (sans chemin) pour dédoublonner un seul run.
+"""
+import json
+import re
+import zlib
+from difflib import SequenceMatcher
+from pathlib import Path
+import numpy as np
+import config
+from .fusion import normalize_text
+from .models import OddsBatch, format_odd, format_time
+
+
+MERSENNE_PRIME = (1 << 31) - 1
+SEED = 1
+
+
+def boost_text(odd):
+    """Texte comparé : description, à défaut sport et compétition"""
+    return odd.description or f"{odd.sport} {odd.competition}"
+
+
+def boost_key(odd):
+    """Clé exacte d'un boost : heure du match + cote boostée"""
+    return f"{format_time(odd.heure)}|{format_odd(odd.cote_boostee)}"
+
+
+def dedupe_odds(odds, index=None):
+    """Cotes sans quasi-doublons (même heure, même cote, texte quasi identique)
+
+    Utilisé par toutes les méthodes ; sans index, le dédoublonnage vaut pour ce run.
+    """
+    index = index if index is not None else FuzzyIndex()
+    unique = OddsBatch(odds.timestamp)
+    for odd in odds:
+        if not index.seen(boost_text(odd), boost_key(odd)):
+            unique.add(odd)
+    return unique
+
+
+def lsh_bands(num_perm, threshold):
+    """(bandes, lignes) du découpage LSH
+
+    Le seuil de collision (1/b)^(1/r) est pris juste sous le seuil voulu (marge
+    de 10 %) : un quasi-doublon tombe presque toujours dans un même seau, les
+    faux candidats sont écartés par la comparaison des signatures.
+    """
+    options = [(num_perm // r, r) for r in range(1, num_perm + 1)]
+    below = [o for o in options if (1 / o[0]) ** (1 / o[1]) <= threshold * 0.9]
+    return max(below or options[:1], key=lambda o: (1 / o[0]) ** (1 / o[1]))
+
+
+class FuzzyIndex:
+    """Index MinHash/LSH : « ce boost a-t-il déjà été vu ? »"""
+
+    def __init__(self, path=None, threshold=None, settings=None):
+        self.settings = settings or config.FUZZY_DEDUP
+        self.threshold = threshold or self.settings['threshold']
+        self.num_perm = self.settings['num_perm']
+        self.shingle_size = self.settings['shingle_size']
+        self.exact_words = set(self.settings['exact_words'])
+        self.word_similarity = self.settings['word_similarity']
+        self.bands, self.rows = lsh_bands(self.num_perm, self.threshold)
+
+        # Permutations h(x) = (a*x + b) mod p, fixées pour rester valables d'un run à l'autre
+        rng = np.random.RandomState(SEED)
+        self.a = rng.randint(1, MERSENNE_PRIME, size=self.num_perm).astype(np.uint64)
+        self.b = rng.randint(0, MERSENNE_PRIME, size=self.num_perm).astype(np.uint64)
+
+        self.path = Path(path) if path else None
+        self.keys = []
+        self.words = []
+        self.signatures = []
+        self.buckets = [{} for _ in range(self.bands)]
+        if self.path is not None:
+            self.sig_path = self.path.with_suffix('.sig')
+            self.meta_path = self.path.with_suffix('.meta.json')
+            self.load()
+
+    # --- Signatures -------------------------------------------------------------
+
+    def shingles(self, text):
+        text = normalize_text(text)
+        k = self.shingle_size
+        if len(text) <= k:
+            return {text}
+        return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+    def signature(self, text):
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in self.shingles(text)), dtype=np.uint64
+        )
+        permuted = (self.a[:, None] * (hashes[None, :] % MERSENNE_PRIME) + self.b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def exact_key(self, text, key):
+        """Clé de l'appelant + nombres et mots plus/moins du texte, dans l'ordre"""
+        anchors = [
+            word for word in normalize_text(text).split()
+            if re.fullmatch(r'\d+', word) or word in self.exact_words
+        ]
+        return f"{key}|{' '.join(anchors)}"
+
+    def close_words(self, words, other):
+        """True si les mots propres à chaque texte sont des lectures proches de l'autre"""
+        for own, rest in ((words - other, other - words), (other - words, words - other)):
+            for word in own:
+                if not any(SequenceMatcher(None, word, candidate).ratio() >= self.word_similarity
+                           for candidate in rest):
+                    return False
+        return True
+
+    def _band_keys(self, signature, key):
+        r = self.rows
+        return [hash((key, signature[i * r:(i + 1) * r].tobytes())) for i in range(self.bands)]
+
+    # --- Requêtes ---------------------------------------------------------------
+
+    def query(self, text, key=''):
+        """(indice, similarité) de l'entrée la plus proche au-dessus du seuil, sinon None"""
+        signature = self.signature(text)
+        return self._query(signature, self.exact_key(text, key), set(normalize_text(text).split()))
+
+    def _query(self, signature, key, words):
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature, key)):
+            candidates.update(bucket.get(band_key, ()))
+        best = None
+        for candidate in candidates:
+            if self.keys[candidate] != key or not self.close_words(words, self.words[candidate]):
+                continue
+            score = float(np.mean(self.signatures[candidate] == signature))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best
+
+    def add(self, text, key=''):
+        """Ajoute une entrée (écrite sur disque si l'index est persistant)"""
+        signature = self.signature(text)
+        return self._add(text, key, signature)
+
+    def _add(self, text, key, signature, persist=True):
+        entry_id = len(self.keys)
+        exact = self.exact_key(text, key)
+        self.keys.append(exact)
+        self.words.append(set(normalize_text(text).split()))
+        self.signatures.append(signature)
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature, exact)):
+            bucket.setdefault(band_key, []).append(entry_id)
+        if persist and self.path is not None:
+            # Texte d'abord : les signatures se recalculent depuis le JSONL
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'text': text}, ensure_ascii=False) + '\n')
+            with open(self.sig_path, 'ab') as f:
+                f.write(signature.tobytes())
+        return entry_id
+
+    def seen(self, text, key=''):
+        """True si un quasi-doublon est déjà indexé ; sinon l'ajoute et retourne False"""
+        signature = self.signature(text)
+        if self._query(signature, self.exact_key(text, key), set(normalize_text(text).split())) is not None:
+            return True
+        self._add(text, key, signature)
+        return False
+
+    def __len__(self):
+        return len(self.keys)
+
+    # --- Persistance ------------------------------------------------------------
+
+    def _meta(self):
+        return {'num_perm': self.num_perm, 'shingle_size': self.shingle_size, 'seed': SEED}
+
+    def _save_meta(self):
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump(self._meta(), f)
+
+    def load(self):
+        """Relit l'index ; les signatures manquantes ou périmées sont recalculées"""
+        if not self.path.exists():
+            self._save_meta()
+            return
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # Dernière ligne tronquée par une écriture interrompue
+                    continue
+
+        # Signatures réutilisables seulement si calculées avec les mêmes paramètres
+        stored = 0
+        signatures = np.zeros((0, self.num_perm), dtype=np.uint32)
+        meta = None
+        if self.meta_path.exists():
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        if meta == self._meta() and self.sig_path.exists():
+            raw = np.fromfile(self.sig_path, dtype=np.uint32)
+            stored = len(raw) // self.num_perm
+            rows = min(stored, len(entries))
+            signatures = raw[:rows * self.num_perm].reshape(rows, self.num_perm)
+
+        if stored != len(entries):
+            missing = [self.signature(entry['text'])[None, :] for entry in entries[len(signatures):]]
+            signatures = np.vstack([signatures] + missing)
+            signatures.tofile(self.sig_path)
+            self._save_meta()
+
+        for entry, signature in zip(entries, signatures):
+            self._add(entry['text'], entry['key'], signature, persist=False)
+
+    def extend(self, entries):
+        """Indexe des (texte, clé) en masse, p. ex. depuis un historique existant
+
+        Retourne le nombre d'entrées ajoutées (les quasi-doublons sont ignorés).
+        """
+        added = 0
+        for text, key in entries:
+            if not self.seen(text, key):
+                added += 1
+        return added
@@ -0,0 +1,215 @@
+"""
+Historique des cotes en ajout seul (JSONL) avec index annexe par date
+
+Chaque ajout écrit les nouvelles lignes en fin de fichier puis fait un fsync :
+le coût ne dépend plus de la taille de l'historique, et une écriture
+interrompue ne peut abîmer que la dernière ligne (tronquée à la reprise).
+L'index annexe enregistre, pour chaque bloc ajouté, sa position dans le
+fichier, sa date et ses timestamps min/max : une lecture par plage de dates
+ne lit que les blocs concernés.
+"""
+import json
+import os
+from pathlib import Path
+import config
+from .schema import as_dict
+
+
+# Champs qui identifient une cote lors de la compaction
+IDENTITY_FIELDS = ['timestamp', 'method', 'heure', 'description', 'cote_originale', 'cote_boostee']
+
+
+def _fsync_write(path, text):
+    """Remplace un fichier de façon atomique (écriture + fsync + rename)"""
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(path)
+
+
+class HistoryStore:
+    """Historique JSONL en ajout seul, lisible par plage de dates"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or config.JSON_DIR / 'history.jsonl')
+        self.index_path = self.path.with_suffix('.idx.json')
+        self.index = self._load_index()
+        self.recover()
+
+    # --- Index ----------------------------------------------------------------
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return []
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Index d'historique illisible, reconstruction: {e}")
+            return []
+
+    def _save_index(self):
+        _fsync_write(self.index_path, json.dumps(self.index))
+
+    @staticmethod
+    def _segments(records, offset, lines):
+        """Un bloc d'index par date, dans l'ordre d'écriture des lignes"""
+        segments = []
+        for record, line in zip(records, lines):
+            timestamp = record.get('timestamp', '')
+            date = timestamp[:10]
+            if not segments or segments[-1]['date'] != date:
+                segments.append({
+                    'date': date, 'offset': offset, 'end': offset,
+                    'first': timestamp, 'last': timestamp, 'count': 0
+                })
+            segment = segments[-1]
+            segment['end'] += len(line)
+            segment['first'] = min(segment['first'], timestamp)
+            segment['last'] = max(segment['last'], timestamp)
+            segment['count'] += 1
+            offset += len(line)
+        return segments
+
+    def _extend_index(self, segments):
+        """Ajoute des blocs à l'index en prolongeant le dernier si possible
+
+        Un bloc de même date qui suit directement le dernier dans le fichier
+        l'agrandit : l'index garde environ un bloc par jour au lieu d'un par
+        ajout, et sa réécriture reste de taille constante.
+        """
+        for segment in segments:
+            last = self.index[-1] if self.index else None
+            if last and last['date'] == segment['date'] and last['end'] == segment['offset']:
+                last['end'] = segment['end']
+                last['first'] = min(last['first'], segment['first'])
+                last['last'] = max(last['last'], segment['last'])
+                last['count'] += segment['count']
+            else:
+                self.index.append(segment)
+
+    def recover(self):
+        """Remet fichier et index en cohérence après une interruption
+
+        Une dernière ligne incomplète est tronquée ; les lignes écrites mais
+        absentes de l'index (arrêt entre les deux fsync) sont réindexées.
+        """
+        if not self.path.exists():
+            self.index = []
+            return
+        size = self.path.stat().st_size
+        indexed = self.index[-1]['end'] if self.index else 0
+        if indexed > size:
+            # Index en avance sur les données : on le reconstruit entièrement
+            self.index, indexed = [], 0
+        if indexed == size:
+            return
+
+        with open(self.path, 'rb+') as f:
+            f.seek(indexed)
+            tail = f.read()
+            complete = tail.rfind(b'\n') + 1
+            if complete < len(tail):
+                print(f"⚠️ Historique: {len(tail) - complete} octets d'une ligne incomplète supprimés")
+                f.truncate(indexed + complete)
+                f.flush()
+                os.fsync(f.fileno())
+
+        records, lines = [], []
+        for raw in tail[:complete].splitlines(keepends=True):
+            try:
+                records.append(json.loads(raw))
+                lines.append(raw)
+            except ValueError:
+                records.append({})
+                lines.append(raw)
+        self._extend_index(self._segments(records, indexed, lines))
+        self._save_index()
+
+    # --- Écriture -------------------------------------------------------------
+
+    def append(self, records):
+        """Ajoute des cotes en fin d'historique (fsync avant de rendre la main)"""
+        if not records:
+            return self.path
+        records = [as_dict(record) for record in records]
+        lines = [
+            (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+            for record in records
+        ]
+        offset = self.path.stat().st_size if self.path.exists() else 0
+        with open(self.path, 'ab') as f:
+            f.write(b''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self._extend_index(self._segments(records, offset, lines))
+        self._save_index()
+        return self.path
+
+    def compact(self):
+        """Réécrit l'historique trié par timestamp, sans doublons
+
+        Retourne (lignes avant, lignes après).
+        """
+        records = list(self.read())
+        unique = {}
+        for record in records:
+            key = tuple(record.get(f, '') for f in IDENTITY_FIELDS)
+            unique.setdefault(key, record)
+        ordered = sorted(unique.values(), key=lambda r: r.get('timestamp', ''))
+
+        lines = [
+            (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+            for record in ordered
+        ]
+        tmp_path = self.path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self.path)
+        self.index = self._segments(ordered, 0, lines)
+        self._save_index()
+        return len(records), len(ordered)
+
+    # --- Lecture --------------------------------------------------------------
+
+    def read(self, start=None, end=None):
+        """Itère sur les cotes dont le timestamp est dans [start, end]
+
+        `start` et `end` sont des dates ("2024-01-31") ou des timestamps ISO.
+        Seuls les blocs d'index qui recoupent la plage sont lus.
+        """
+        if not self.path.exists():
+            return
+        start = start or ''
+        # Une date seule comme borne haute inclut toute la journée
+        end = (end + '\uffff') if end else '\uffff'
+        with open(self.path, 'rb') as f:
+            for segment in self.index:
+                if segment['last'] < start or segment['first'] > end:
+                    continue
+                f.seek(segment['offset'])
+                for raw in f.read(segment['end'] - segment['offset']).splitlines():
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if start <= record.get('timestamp', '') <= end:
+                        yield record
+
+    def dates(self):
+        """Nombre de cotes par date"""
+        counts = {}
+        for segment in self.index:
+            counts[segment['date']] = counts.get(segment['date'], 0) + segment['count']
+        return counts
+
+    def import_json(self, json_path):
+        """Importe un ancien history.json (liste JSON) dans l'historique"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        self.append(records)
+        return len(records)
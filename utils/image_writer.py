@@ -0,0 +1,59 @@
+"""
+Écriture des images sur disque en arrière-plan
+
+Les screenshots restent en mémoire dans le chemin capture → prétraitement →
+OCR ; leur sauvegarde est une sortie annexe, faite par un thread dédié pour
+ne pas ralentir le scraping.
+"""
+import atexit
+import queue
+import threading
+import config
+
+
+class AsyncImageWriter:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def save(self, image, path):
+        """Programme l'écriture d'une image (octets PNG ou tableau NumPy)
+
+        Retourne le chemin, ou None si la sauvegarde est désactivée.
+        """
+        if not config.SAVE_SCREENSHOTS:
+            return None
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='image-writer', daemon=True)
+                self._thread.start()
+
+        self._queue.put((path, image))
+        return path
+
+    def _run(self):
+        while True:
+            path, image = self._queue.get()
+            try:
+                if isinstance(image, (bytes, bytearray)):
+                    with open(path, 'wb') as f:
+                        f.write(image)
+                else:
+                    import cv2
+                    cv2.imwrite(str(path), image)
+            except Exception as e:
+                print(f"⚠️ Erreur sauvegarde image {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Attend la fin des écritures en cours"""
+        self._queue.join()
+
+
+image_writer = AsyncImageWriter()
+
+# Ne pas perdre les dernières images à la sortie du programme
+atexit.register(image_writer.flush)
@@ -0,0 +1,229 @@
+"""
+Modèle commun des cotes boostées, partagé par tous les scrapers et exports
+
+Une cote est un BoostedOdd à slots : cotes en float, heure du match en
+`datetime.time`, un seul timestamp par run. Un OddsBatch range les cotes d'un
+run en colonnes (tableaux `array('d')` pour les cotes) et ne crée les
+BoostedOdd qu'à la lecture.
+
+Le format texte historique ("2,60", "20:45", timestamp ISO) n'est produit
+qu'à l'export, par `to_dict()`. Pour le code existant, un BoostedOdd se lit
+aussi comme un dict (`odd['cote_boostee']`, `odd.get(...)`) dans ce format.
+"""
+import math
+import re
+from array import array
+from datetime import datetime, time
+import config
+from .schema import COTES_SCHEMA
+
+
+TIME_RE = re.compile(r'\b([0-2]?[0-9]):([0-5][0-9])\b')
+
+
+def parse_odd(value):
+    """Cote "2,60", "2.6" ou 2.6 en float (None si absente ou illisible)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = float(value)
+        return None if math.isnan(value) else value
+    try:
+        return float(str(value).replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def parse_time(value):
+    """Heure "20:45" en datetime.time (None si absente ou invalide)"""
+    if isinstance(value, time) or value is None:
+        return value
+    match = TIME_RE.search(str(value))
+    if not match:
+        return None
+    try:
+        return time(int(match.group(1)), int(match.group(2)))
+    except ValueError:
+        return None
+
+
+def parse_timestamp(value):
+    if isinstance(value, datetime) or value is None:
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def format_odd(value):
+    return '' if value is None else f"{value:.2f}".replace('.', ',')
+
+
+def format_time(value):
+    return '' if value is None else value.strftime(config.TIME_FORMAT)
+
+
+class BoostedOdd:
+    """Une cote boostée typée"""
+
+    __slots__ = tuple(COTES_SCHEMA)
+
+    def __init__(self, timestamp=None, method='', heure=None, sport='', competition='',
+                 description='', cote_originale=None, cote_boostee=None):
+        self.timestamp = parse_timestamp(timestamp)
+        self.method = method or ''
+        self.heure = parse_time(heure)
+        self.sport = sport or ''
+        self.competition = competition or ''
+        self.description = description or ''
+        self.cote_originale = parse_odd(cote_originale)
+        self.cote_boostee = parse_odd(cote_boostee)
+
+    @classmethod
+    def from_dict(cls, record, method=None, timestamp=None):
+        """Depuis un dict (format texte ou typé) ; method/timestamp imposés si donnés"""
+        return cls(
+            timestamp=timestamp or record.get('timestamp'),
+            method=method or record.get('method'),
+            heure=record.get('heure'),
+            sport=record.get('sport'),
+            competition=record.get('competition'),
+            description=record.get('description'),
+            cote_originale=record.get('cote_originale'),
+            cote_boostee=record.get('cote_boostee')
+        )
+
+    def to_dict(self, typed=False):
+        """Dict dans l'ordre du schéma : format d'export texte, ou valeurs typées"""
+        if typed:
+            return {field: getattr(self, field) for field in COTES_SCHEMA}
+        return {
+            'timestamp': self.timestamp.isoformat() if self.timestamp else '',
+            'method': self.method,
+            'heure': format_time(self.heure),
+            'sport': self.sport,
+            'competition': self.competition,
+            'description': self.description,
+            'cote_originale': format_odd(self.cote_originale),
+            'cote_boostee': format_odd(self.cote_boostee)
+        }
+
+    # Lecture à la manière d'un dict (valeurs au format d'export)
+    def __getitem__(self, field):
+        if field not in COTES_SCHEMA:
+            raise KeyError(field)
+        value = getattr(self, field)
+        if field == 'heure':
+            return format_time(value)
+        if field in ('cote_originale', 'cote_boostee'):
+            return format_odd(value)
+        if field == 'timestamp':
+            return value.isoformat() if value else ''
+        return value
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(COTES_SCHEMA)
+
+    def __eq__(self, other):
+        if not isinstance(other, BoostedOdd):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in COTES_SCHEMA)
+
+    def __repr__(self):
+        return (
+            f"BoostedOdd({self.method} {format_time(self.heure)} {self.sport!r} "
+            f"{format_odd(self.cote_originale)} -> {format_odd(self.cote_boostee)})"
+        )
+
+
+class OddsBatch:
+    """Cotes d'un run en colonnes, avec un timestamp unique
+
+    Les cotes sont stockées dans des `array('d')` (NaN si absente), les
+    textes dans des listes ; `len`, l'itération et l'indexation rendent des
+    BoostedOdd.
+    """
+
+    __slots__ = ['timestamp', 'methods', 'heures', 'sports', 'competitions',
+                 'descriptions', 'cotes_originales', 'cotes_boostees']
+
+    def __init__(self, timestamp=None):
+        self.timestamp = parse_timestamp(timestamp) or datetime.now()
+        self.methods = []
+        self.heures = []
+        self.sports = []
+        self.competitions = []
+        self.descriptions = []
+        self.cotes_originales = array('d')
+        self.cotes_boostees = array('d')
+
+    @classmethod
+    def from_dicts(cls, records, method=None, timestamp=None):
+        batch = cls(timestamp)
+        for record in records:
+            batch.add(record, method)
+        return batch
+
+    @classmethod
+    def concat(cls, batches, timestamp=None):
+        """Fusionne plusieurs lots (ex. une page chacun) en un seul"""
+        batches = [batch for batch in batches if batch]
+        merged = cls(timestamp or (batches[0].timestamp if batches else None))
+        for batch in batches:
+            merged.extend(batch)
+        return merged
+
+    def add(self, record, method=None):
+        """Ajoute une cote (dict ou BoostedOdd) ; elle prend le timestamp du run"""
+        if isinstance(record, BoostedOdd):
+            record = record.to_dict(typed=True)
+        original = parse_odd(record.get('cote_originale'))
+        boosted = parse_odd(record.get('cote_boostee'))
+        self.methods.append(method or record.get('method') or '')
+        self.heures.append(parse_time(record.get('heure')))
+        self.sports.append(record.get('sport') or '')
+        self.competitions.append(record.get('competition') or '')
+        self.descriptions.append(record.get('description') or '')
+        self.cotes_originales.append(math.nan if original is None else original)
+        self.cotes_boostees.append(math.nan if boosted is None else boosted)
+
+    def extend(self, records, method=None):
+        for record in records:
+            self.add(record, method)
+
+    def __len__(self):
+        return len(self.cotes_boostees)
+
+    def __getitem__(self, index):
+        original = self.cotes_originales[index]
+        boosted = self.cotes_boostees[index]
+        odd = BoostedOdd.__new__(BoostedOdd)
+        odd.timestamp = self.timestamp
+        odd.method = self.methods[index]
+        odd.heure = self.heures[index]
+        odd.sport = self.sports[index]
+        odd.competition = self.competitions[index]
+        odd.description = self.descriptions[index]
+        odd.cote_originale = None if math.isnan(original) else original
+        odd.cote_boostee = None if math.isnan(boosted) else boosted
+        return odd
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def to_dicts(self, typed=False):
+        return [odd.to_dict(typed) for odd in self]
+
+    def __repr__(self):
+        return f"OddsBatch({len(self)} cotes, {self.timestamp.isoformat()})"
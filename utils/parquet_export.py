@@ -0,0 +1,81 @@
+"""
+Export Parquet typé et partitionné par date pour l'analyse de l'historique
+
+Les cotes sont écrites en colonnes typées (cotes en float, timestamp,
+méthode et sport en catégories) dans un dataset Parquet partitionné par date
+(date=AAAA-MM-JJ/). Les statistiques par row group permettent aux moteurs de
+requête (pyarrow, DuckDB, pandas) de ne lire que les fichiers et blocs utiles.
+"""
+import config
+from .models import BoostedOdd, format_time
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+STRING_COLUMNS = ['heure', 'competition', 'description']
+CATEGORY_COLUMNS = ['method', 'sport']
+ODDS_COLUMNS = ['cote_originale', 'cote_boostee']
+
+
+def cotes_schema():
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [('timestamp', pa.timestamp('us'))]
+        + [(c, category) for c in CATEGORY_COLUMNS]
+        + [(c, pa.string()) for c in STRING_COLUMNS]
+        + [(c, pa.float64()) for c in ODDS_COLUMNS]
+        + [('date', pa.string())]
+    )
+
+
+def to_table(records, default_date=None):
+    """Table Arrow typée (BoostedOdd ou dicts) ; `default_date` si le timestamp manque"""
+    odds = [r if isinstance(r, BoostedOdd) else BoostedOdd.from_dict(r) for r in records]
+    dates = [
+        odd.timestamp.strftime(config.DATE_FORMAT) if odd.timestamp else (default_date or 'inconnue')
+        for odd in odds
+    ]
+    arrays = [pa.array([odd.timestamp for odd in odds], pa.timestamp('us'))]
+    arrays += [
+        pa.array([getattr(odd, c) or None for odd in odds], pa.string()).dictionary_encode()
+        for c in CATEGORY_COLUMNS
+    ]
+    arrays.append(pa.array([format_time(odd.heure) or None for odd in odds], pa.string()))
+    arrays += [
+        pa.array([getattr(odd, c) or None for odd in odds], pa.string())
+        for c in STRING_COLUMNS if c != 'heure'
+    ]
+    arrays += [pa.array([getattr(odd, c) for odd in odds], pa.float64()) for c in ODDS_COLUMNS]
+    arrays.append(pa.array(dates, pa.string()))
+    return pa.Table.from_arrays(arrays, schema=cotes_schema())
+
+
+def write_parquet(records, basename, root=None, default_date=None):
+    """Écrit les cotes dans le dataset partitionné (root/date=.../basename-N.parquet)
+
+    Un même `basename` réécrit ses propres fichiers : relancer une conversion
+    ne crée pas de doublons.
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow est requis pour l'export Parquet (pip install pyarrow)")
+
+    root = root or config.PARQUET_DIR
+    partitioning = ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive')
+    file_options = ds.ParquetFileFormat().make_write_options(
+        compression='zstd', write_statistics=True
+    )
+    ds.write_dataset(
+        to_table(records, default_date),
+        str(root),
+        format='parquet',
+        partitioning=partitioning,
+        basename_template=f"{basename}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        file_options=file_options
+    )
+    return root
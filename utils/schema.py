@@ -0,0 +1,26 @@
+"""
+Schéma déclaré des cotes exportées (ordre des colonnes figé)
+"""
+
+COTES_SCHEMA = [
+    'timestamp', 'method', 'heure', 'sport', 'competition',
+    'description', 'cote_originale', 'cote_boostee'
+]
+
+# Cotes fusionnées (--method all / auto) : confiance globale puis par champ
+FUSED_SCHEMA = COTES_SCHEMA + ['confidence'] + [
+    f'confidence_{field}' for field in
+    ['heure', 'sport', 'competition', 'description', 'cote_originale', 'cote_boostee']
+]
+
+
+def as_dict(record):
+    """Dict au format d'export, que la cote soit un BoostedOdd ou déjà un dict"""
+    return record.to_dict() if hasattr(record, 'to_dict') else record
+
+
+def project(record, schema=None):
+    """Cote réduite aux champs du schéma, dans l'ordre ('' si absent)"""
+    schema = schema or COTES_SCHEMA
+    record = as_dict(record)
+    return {field: '' if record.get(field) is None else record.get(field) for field in schema}
@@ -0,0 +1,116 @@
+"""
+Stockage SQLite (WAL) des cotes avec dédoublonnage par index unique
+
+Au lieu de relire tout l'historique, concaténer et dédoublonner à chaque run,
+chaque ligne est insérée avec INSERT OR IGNORE sur un index unique couvrant
+la clé de dédoublonnage : le coût d'un run ne dépend que du nombre de
+nouvelles lignes, même avec des millions de lignes en base.
+"""
+import csv
+import sqlite3
+from pathlib import Path
+import config
+from .schema import COTES_SCHEMA, as_dict
+
+
+# Cotes produites par les scrapers (main.py)
+COTES_COLUMNS = COTES_SCHEMA
+COTES_KEY = ['method', 'heure', 'sport', 'description', 'cote_originale', 'cote_boostee']
+
+# Lignes de scripts/scrape_ocr.py (data/historique.csv)
+OCR_HISTORY_COLUMNS = ['timestamp', 'heure_event', 'texte', 'cote_boostee', 'bookmaker']
+OCR_HISTORY_KEY = ['heure_event', 'texte', 'cote_boostee', 'bookmaker']
+
+IMPORT_BATCH = 10000
+
+
+class SQLiteStore:
+    """Table SQLite avec clé de dédoublonnage unique"""
+
+    def __init__(self, path=None, table='cotes', columns=None, key=None):
+        self.path = Path(path or config.SQLITE_PATH)
+        self.table = table
+        self.columns = columns or COTES_COLUMNS
+        self.key = key or COTES_KEY
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._create()
+
+    def _create(self):
+        # NOT NULL DEFAULT '' : deux NULL ne sont jamais égaux pour un index unique
+        columns = ', '.join(f'"{c}" TEXT NOT NULL DEFAULT \'\'' for c in self.columns)
+        key = ', '.join(f'"{c}"' for c in self.key)
+        with self.conn:
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({columns})')
+            self.conn.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{self.table}_dedup" ON "{self.table}" ({key})'
+            )
+            if 'timestamp' in self.columns:
+                self.conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{self.table}_timestamp" ON "{self.table}" (timestamp)'
+                )
+
+    def _row(self, record):
+        record = as_dict(record)
+        return tuple('' if record.get(c) is None else str(record.get(c)) for c in self.columns)
+
+    def insert(self, records):
+        """Insère les lignes absentes ; retourne le nombre de lignes ajoutées"""
+        placeholders = ', '.join('?' for _ in self.columns)
+        names = ', '.join(f'"{c}"' for c in self.columns)
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT OR IGNORE INTO "{self.table}" ({names}) VALUES ({placeholders})',
+                (self._row(record) for record in records)
+            )
+        return self.conn.total_changes - before
+
+    def import_csv(self, csv_path, converters=None):
+        """Importe un CSV existant par lots (les doublons sont ignorés)
+
+        `converters` associe à une colonne une fonction de normalisation.
+        Retourne (lignes lues, lignes ajoutées).
+        """
+        converters = converters or {}
+        read = added = 0
+        batch = []
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                for column, convert in converters.items():
+                    if record.get(column):
+                        record[column] = convert(record[column])
+                batch.append(record)
+                if len(batch) >= IMPORT_BATCH:
+                    read += len(batch)
+                    added += self.insert(batch)
+                    batch = []
+        if batch:
+            read += len(batch)
+            added += self.insert(batch)
+        return read, added
+
+    def count(self):
+        return self.conn.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    def rows(self, since=None):
+        """Itère sur les lignes (dictionnaires), éventuellement depuis un timestamp"""
+        names = ', '.join(f'"{c}"' for c in self.columns)
+        query = f'SELECT {names} FROM "{self.table}"'
+        params = ()
+        if since:
+            query += ' WHERE timestamp >= ?'
+            params = (since,)
+        for row in self.conn.execute(query + ' ORDER BY rowid', params):
+            yield dict(zip(self.columns, row))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
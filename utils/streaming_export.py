@@ -0,0 +1,117 @@
+"""
+Export en flux : les cotes sont écrites au fil de l'eau, en une passe
+
+Chaque sink ouvre son fichier à la première cote reçue, écrit chaque cote
+projetée sur le schéma déclaré (colonnes toujours dans le même ordre) et
+vide son tampon régulièrement : la mémoire reste constante quel que soit le
+nombre de cotes, et un export peut commencer avant la fin du scraping.
+"""
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+from .schema import COTES_SCHEMA, project
+
+
+class Sink:
+    """Fichier de sortie ouvert à la première écriture"""
+
+    def __init__(self, path, schema=None, flush_every=1):
+        self.path = Path(path)
+        self.schema = schema or COTES_SCHEMA
+        self.flush_every = flush_every
+        self.count = 0
+        self._file = None
+
+    def _open(self):
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+
+    def _write(self, record):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def touch(self):
+        """Ouvre le fichier même si aucune cote n'arrive (export vide)"""
+        if self._file is None:
+            self._open()
+
+    def write(self, record):
+        self.touch()
+        self._write(project(record, self.schema))
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        """Ferme le fichier ; retourne son chemin (None si rien n'a été écrit)"""
+        if self._file is None:
+            return None
+        self._close()
+        self._file.close()
+        self._file = None
+        return self.path
+
+
+class JSONLinesSink(Sink):
+    """Une cote JSON par ligne"""
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class CSVSink(Sink):
+    """CSV avec les colonnes du schéma"""
+
+    def _open(self):
+        super()._open()
+        self._writer = csv.DictWriter(self._file, fieldnames=self.schema)
+        self._writer.writeheader()
+
+    def _write(self, record):
+        self._writer.writerow(record)
+
+
+class JSONSink(Sink):
+    """Même format que DataExporter.export_json ({timestamp, cotes, count})"""
+
+    def _open(self):
+        super()._open()
+        self._file.write('{\n  "timestamp": %s,\n  "cotes": [' % json.dumps(datetime.now().isoformat()))
+
+    def _write(self, record):
+        separator = ',' if self.count else ''
+        self._file.write(f"{separator}\n    {json.dumps(record, ensure_ascii=False)}")
+
+    def _close(self):
+        self._file.write(f'\n  ],\n  "count": {self.count}\n}}\n')
+
+
+class StreamingExporter:
+    """Répartit chaque cote vers plusieurs sinks en une seule passe"""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    def write(self, record):
+        for sink in self.sinks:
+            sink.write(record)
+
+    def write_all(self, records):
+        """Écrit un itérable de cotes (consommé au fur et à mesure)"""
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+
+    def close(self):
+        """Ferme les sinks ; retourne les chemins des fichiers écrits"""
+        return [path for path in (sink.close() for sink in self.sinks) if path]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()